@@ -0,0 +1,92 @@
+"""Compare the compact node store with a dict of pydantic nodes.
+
+Builds a 100k-node conversation tree both ways (a long conversation with a
+branch every few turns) and reports insert throughput and memory.
+
+    python benchmarks/tree_store.py [nodes]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+from mi_trainer.models.conversation import ConversationTree
+from mi_trainer.models.node_store import NodeRecord
+
+MESSAGES = [
+    "I don't know, I guess I just feel stuck with all of it.",
+    "It sounds like part of you wants things to change.",
+    "What would be different if you cut back?",
+    "My wife keeps bringing it up and I'm tired of it.",
+    "You're feeling pressured by the people around you.",
+]
+
+
+def moves(count: int, seed: int = 0) -> list[int]:
+    """For each message, how many steps to rewind before adding it."""
+    rng = random.Random(seed)
+    return [rng.randint(1, 6) if rng.random() < 0.1 else 0 for _ in range(count)]
+
+
+def build_pydantic(rewinds: list[int]) -> dict[str, NodeRecord]:
+    """The previous representation: a dict of validated node models."""
+    nodes: dict[str, NodeRecord] = {}
+    current = None
+    for i, steps in enumerate(rewinds):
+        for _ in range(steps):
+            if current is not None and nodes[current].parent_id is not None:
+                current = nodes[current].parent_id
+        node = NodeRecord(
+            id=str(uuid.uuid4())[:8],
+            role="user" if i % 2 else "client",
+            content=MESSAGES[i % len(MESSAGES)] + f" ({i})",
+            parent_id=current,
+        )
+        nodes[node.id] = node
+        if current is not None:
+            nodes[current].children.append(node.id)
+        current = node.id
+    return nodes
+
+
+def build_store(rewinds: list[int]) -> ConversationTree:
+    tree = ConversationTree()
+    for i, steps in enumerate(rewinds):
+        if steps:
+            tree.rewind(steps)
+        tree.add_message("user" if i % 2 else "client", MESSAGES[i % len(MESSAGES)] + f" ({i})")
+    return tree
+
+
+def measure(label: str, build, rewinds: list[int]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(rewinds)
+    elapsed = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Time again without tracing, which slows allocation-heavy code down
+    started = time.perf_counter()
+    build(rewinds)
+    untraced = time.perf_counter() - started
+    print(
+        f"{label:>10}: {len(rewinds) / untraced:>10,.0f} inserts/s  "
+        f"{memory / len(rewinds):>6,.0f} bytes/node  "
+        f"({elapsed:.2f}s traced)"
+    )
+    del result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rewinds = moves(count)
+    print(f"{count:,} nodes")
+    measure("pydantic", build_pydantic, rewinds)
+    measure("store", build_store, rewinds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare loading a trusted session file with validating it in full.
+
+Saves a 10k-node session (branching every few turns, with coach feedback on
+each practitioner turn) twice: stamped with the schema version and checksum,
+as the app saves it, and without the stamp, which forces validation. Reports
+the best of several loads of each.
+
+    python benchmarks/trusted_load.py [nodes]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from mi_trainer.models.conversation import ConversationTree
+from mi_trainer.models.feedback import CoachFeedback
+from mi_trainer.models.scenario import Scenario
+from mi_trainer.storage.sessions import Session, load_session
+from mi_trainer.storage.trusted import dump_json
+
+from tree_store import MESSAGES, moves
+
+FEEDBACK = CoachFeedback(
+    techniques_used=["complex_reflection", "open_question"],
+    mi_consistent=["Reflected the client's ambivalence without taking sides."],
+    suggestions=["Try a double-sided reflection here."],
+    overall_note="Good empathy; keep the focus on the client's own reasons.",
+)
+
+REPEATS = 5
+
+
+def build_session(rewinds: list[int]) -> Session:
+    tree = ConversationTree()
+    for i, steps in enumerate(rewinds):
+        if steps:
+            tree.rewind(steps)
+        role = "user" if i % 2 else "client"
+        tree.add_message(
+            role,
+            MESSAGES[i % len(MESSAGES)] + f" ({i})",
+            coach_feedback=FEEDBACK if role == "user" else None,
+        )
+    now = datetime.now()
+    scenario = Scenario(
+        id="benchmark",
+        name="Benchmark",
+        description="A long, branching practice session",
+        demographics="45-year-old",
+        presenting_issue="Drinking",
+    )
+    return Session(scenario=scenario, conversation=tree, created_at=now, updated_at=now)
+
+
+def measure(label: str, path: Path) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        load_session(path)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:>10}: {best * 1000:>8.1f} ms  ({path.stat().st_size / 1e6:.1f} MB)")
+    return best
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    session = build_session(moves(count))
+    print(f"{count:,} nodes")
+    with tempfile.TemporaryDirectory() as directory:
+        trusted = Path(directory) / "trusted.json"
+        trusted.write_text(dump_json(session))
+        validated = Path(directory) / "validated.json"
+        validated.write_text(session.model_dump_json(indent=2))
+
+        slow = measure("validated", validated)
+        fast = measure("trusted", trusted)
+    print(f"{slow / fast:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
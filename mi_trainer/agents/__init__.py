@@ -3,5 +3,6 @@
 from mi_trainer.agents.client import ClientAgent
 from mi_trainer.agents.coach import CoachAgent
 from mi_trainer.agents.scenario_builder import ScenarioBuilderAgent
+from mi_trainer.agents.summarizer import SummarizerAgent
 
-__all__ = ["ClientAgent", "CoachAgent", "ScenarioBuilderAgent"]
+__all__ = ["ClientAgent", "CoachAgent", "ScenarioBuilderAgent", "SummarizerAgent"]
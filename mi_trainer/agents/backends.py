@@ -0,0 +1,441 @@
+"""LLM backends that agents send their requests through."""
+
+import asyncio
+import hashlib
+import json
+import random
+from typing import Any, AsyncIterator, Optional
+
+import anthropic
+import httpx
+from pydantic import BaseModel, Field
+
+from mi_trainer.agents.connection import close_clients, get_client
+from mi_trainer.agents.scheduler import Priority, RequestScheduler, get_scheduler
+from mi_trainer.agents.tokens import CHARS_PER_TOKEN, estimate_request_tokens, estimate_tokens
+from mi_trainer.config import (
+    AGENT_BACKENDS,
+    FAKE_RESPONSE_TOKENS,
+    FAKE_TOKENS_PER_SECOND,
+    HTTP_TIMEOUT,
+    LOCAL_LLM_API_KEY,
+    LOCAL_LLM_BASE_URL,
+    LOCAL_LLM_MODEL,
+    PROMPT_CACHING,
+)
+from mi_trainer.models.usage import TokenUsage
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def cache_breakpoint(block: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a content block marked as the end of a cacheable prefix."""
+    if not PROMPT_CACHING:
+        return block
+    return {**block, "cache_control": CACHE_CONTROL}
+
+
+def text_block(text: str) -> dict[str, Any]:
+    """Build a plain text content block."""
+    return {"type": "text", "text": text}
+
+
+def message_text(message: dict[str, Any]) -> str:
+    """Flatten a message's content to plain text."""
+    content = message["content"]
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content)
+
+
+class ToolSpec(BaseModel):
+    """A tool the model is forced to call, constraining its output to a JSON schema."""
+
+    name: str
+    description: str
+    input_schema: dict[str, Any]
+
+
+class LLMRequest(BaseModel):
+    """A single model call, independent of the backend serving it."""
+
+    model: str
+    system: str
+    messages: list[dict[str, Any]]
+    max_tokens: int = 1024
+    priority: Priority = Priority.BACKGROUND
+    agent: str = Field(default="", description="Name of the agent making the call")
+    tool: Optional[ToolSpec] = Field(
+        default=None, description="Force a call to this tool; the output is its JSON input"
+    )
+
+    def estimated_tokens(self) -> int:
+        """Estimate the input tokens of this request, including any tool schema."""
+        estimated = estimate_request_tokens(self.system, self.messages)
+        if self.tool is not None:
+            estimated += estimate_tokens(json.dumps(self.tool.input_schema))
+        return estimated
+
+
+class LLMBackend:
+    """Interface every backend implements.
+
+    `stream` yields text chunks followed by exactly one `TokenUsage` for the
+    call; `complete` returns the full text and its usage. When the request
+    carries a tool, the text is the tool's JSON input, streamed as it is
+    generated.
+    """
+
+    name = "base"
+
+    def stream(self, request: LLMRequest) -> AsyncIterator[str | TokenUsage]:
+        raise NotImplementedError
+
+    async def complete(self, request: LLMRequest) -> tuple[str, TokenUsage]:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release any connections the backend holds."""
+
+
+class AnthropicBackend(LLMBackend):
+    """Anthropic Messages API via the shared client, with prompt caching and scheduling."""
+
+    name = "anthropic"
+
+    def __init__(
+        self,
+        client: Optional[anthropic.AsyncAnthropic] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        self.client = client or get_client()
+        self.scheduler = scheduler or get_scheduler()
+
+    def _build_system(self, system_prompt: str) -> str | list[dict[str, Any]]:
+        """Wrap the system prompt so it is cached across calls."""
+        if not PROMPT_CACHING:
+            return system_prompt
+        return [cache_breakpoint(text_block(system_prompt))]
+
+    def _build_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Mark the conversation prefix for caching.
+
+        Callers that place their own breakpoint (e.g. before a per-turn
+        instruction block) are left alone; otherwise the final content block
+        is marked so the next turn can reuse everything up to here.
+        """
+        if not PROMPT_CACHING or not messages:
+            return messages
+
+        for msg in messages:
+            content = msg["content"]
+            if isinstance(content, list) and any("cache_control" in b for b in content):
+                return messages
+
+        marked = list(messages)
+        last = dict(marked[-1])
+        content = last["content"]
+        blocks = [text_block(content)] if isinstance(content, str) else list(content)
+        blocks[-1] = cache_breakpoint(blocks[-1])
+        last["content"] = blocks
+        marked[-1] = last
+        return marked
+
+    def _params(self, request: LLMRequest) -> dict[str, Any]:
+        """Keyword arguments for a Messages API call."""
+        params = {
+            "model": request.model,
+            "max_tokens": request.max_tokens,
+            "system": self._build_system(request.system),
+            "messages": self._build_messages(request.messages),
+        }
+        if request.tool is not None:
+            params["tools"] = [request.tool.model_dump()]
+            params["tool_choice"] = {"type": "tool", "name": request.tool.name}
+        return params
+
+    @staticmethod
+    def _delta_text(event: Any) -> Optional[str]:
+        """Text or tool-input JSON carried by a raw stream event."""
+        if event.type != "content_block_delta":
+            return None
+        if event.delta.type == "text_delta":
+            return event.delta.text
+        if event.delta.type == "input_json_delta":
+            return event.delta.partial_json
+        return None
+
+    def _usage(self, usage: Any, estimated_tokens: int) -> TokenUsage:
+        """Convert API usage and correct the scheduler's token estimate."""
+        result = TokenUsage(
+            input_tokens=usage.input_tokens or 0,
+            output_tokens=usage.output_tokens or 0,
+            cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+        )
+        actual = result.input_tokens + result.cache_creation_input_tokens
+        self.scheduler.reconcile(estimated_tokens, actual)
+        return result
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str | TokenUsage]:
+        """Stream under the scheduler.
+
+        Failures before the first chunk are retried under the scheduler's
+        policy; once text has been yielded the error is raised to the caller.
+        """
+        estimated = request.estimated_tokens()
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(request.priority, estimated)
+            started = False
+            try:
+                async with self.client.messages.stream(**self._params(request)) as stream:
+                    async for event in stream:
+                        text = self._delta_text(event)
+                        if text:
+                            started = True
+                            yield text
+                    final = await stream.get_final_message()
+                yield self._usage(final.usage, estimated)
+                return
+            except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+                delay = None if started else self.scheduler.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def complete(self, request: LLMRequest) -> tuple[str, TokenUsage]:
+        estimated = request.estimated_tokens()
+        response = await self.scheduler.run(
+            request.priority,
+            estimated,
+            lambda: self.client.messages.create(**self._params(request)),
+        )
+        if request.tool is not None:
+            tool_input = next(
+                (block.input for block in response.content if block.type == "tool_use"), {}
+            )
+            text = json.dumps(tool_input)
+        else:
+            text = response.content[0].text
+        return text, self._usage(response.usage, estimated)
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Any server exposing OpenAI's chat completions API (llama.cpp, vLLM, ...).
+
+    The agent's Claude model name is replaced by the configured local model,
+    and content blocks are flattened since cache markers mean nothing here.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        base_url: str = LOCAL_LLM_BASE_URL,
+        model: str = LOCAL_LLM_MODEL,
+        api_key: str = LOCAL_LLM_API_KEY,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._http = httpx.AsyncClient(headers=headers, timeout=HTTP_TIMEOUT)
+
+    def _payload(self, request: LLMRequest, stream: bool) -> dict[str, Any]:
+        messages = [{"role": "system", "content": request.system}]
+        messages += [
+            {"role": msg["role"], "content": message_text(msg)} for msg in request.messages
+        ]
+        payload = {
+            "model": self.model,
+            "max_tokens": request.max_tokens,
+            "messages": messages,
+            "stream": stream,
+        }
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
+        if request.tool is not None:
+            payload["tools"] = [{
+                "type": "function",
+                "function": {
+                    "name": request.tool.name,
+                    "description": request.tool.description,
+                    "parameters": request.tool.input_schema,
+                },
+            }]
+            payload["tool_choice"] = {"type": "function", "function": {"name": request.tool.name}}
+        return payload
+
+    @staticmethod
+    def _delta_text(delta: dict[str, Any]) -> Optional[str]:
+        """Text or tool-call argument JSON carried by a streamed delta."""
+        for call in delta.get("tool_calls") or []:
+            arguments = (call.get("function") or {}).get("arguments")
+            if arguments:
+                return arguments
+        return delta.get("content")
+
+    @staticmethod
+    def _usage(data: Optional[dict[str, Any]]) -> TokenUsage:
+        data = data or {}
+        return TokenUsage(
+            input_tokens=data.get("prompt_tokens", 0),
+            output_tokens=data.get("completion_tokens", 0),
+        )
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str | TokenUsage]:
+        usage = None
+        async with self._http.stream(
+            "POST", f"{self.base_url}/chat/completions", json=self._payload(request, stream=True)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if event.get("usage"):
+                    usage = event["usage"]
+                for choice in event.get("choices", []):
+                    text = self._delta_text(choice.get("delta") or {})
+                    if text:
+                        yield text
+        yield self._usage(usage)
+
+    async def complete(self, request: LLMRequest) -> tuple[str, TokenUsage]:
+        response = await self._http.post(
+            f"{self.base_url}/chat/completions", json=self._payload(request, stream=False)
+        )
+        response.raise_for_status()
+        data = response.json()
+        message = data["choices"][0]["message"]
+        if request.tool is not None and message.get("tool_calls"):
+            text = message["tool_calls"][0]["function"]["arguments"]
+        else:
+            text = message.get("content") or ""
+        return text, self._usage(data.get("usage"))
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+FAKE_VOCABULARY = (
+    "I", "you", "feel", "really", "think", "maybe", "it", "just", "that", "the",
+    "about", "and", "change", "want", "know", "but", "sometimes", "not", "sure",
+    "why", "what", "because", "work", "family", "time", "hard", "right", "so",
+)
+
+
+def _fake_value(schema: dict[str, Any], rng: random.Random) -> Any:
+    """Generate a value matching a (ref-free) JSON schema."""
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: _fake_value(prop, rng) for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [_fake_value(schema.get("items", {}), rng) for _ in range(rng.randint(1, 3))]
+    if kind == "integer":
+        return rng.randint(schema.get("minimum", 1), schema.get("maximum", 5))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0), schema.get("maximum", 1)), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return " ".join(rng.choice(FAKE_VOCABULARY) for _ in range(rng.randint(3, 8)))
+
+
+class FakeBackend(LLMBackend):
+    """Deterministic synthetic responses at a fixed token rate, for benchmarks.
+
+    The same request always yields the same words, and each token is delayed
+    so the stream runs at `tokens_per_second` (0 for no delay). Tool requests
+    get JSON matching the tool's schema, streamed a few characters per token.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        tokens_per_second: float = FAKE_TOKENS_PER_SECOND,
+        response_tokens: int = FAKE_RESPONSE_TOKENS,
+    ):
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+
+    def _tokens(self, request: LLMRequest) -> list[str]:
+        seed = hashlib.sha256(
+            json.dumps([request.system, request.messages], sort_keys=True).encode("utf-8")
+        ).digest()
+        rng = random.Random(seed)
+        if request.tool is not None:
+            text = json.dumps(_fake_value(request.tool.input_schema, rng))
+            return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+        count = min(request.max_tokens, self.response_tokens)
+        words = [rng.choice(FAKE_VOCABULARY) for _ in range(count)]
+        return [words[0]] + [f" {word}" for word in words[1:]] if words else []
+
+    def _usage(self, request: LLMRequest, tokens: list[str]) -> TokenUsage:
+        return TokenUsage(
+            input_tokens=request.estimated_tokens(),
+            output_tokens=len(tokens),
+        )
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str | TokenUsage]:
+        tokens = self._tokens(request)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for token in tokens:
+            await asyncio.sleep(delay)
+            yield token
+        yield self._usage(request, tokens)
+
+    async def complete(self, request: LLMRequest) -> tuple[str, TokenUsage]:
+        tokens = self._tokens(request)
+        if self.tokens_per_second > 0:
+            await asyncio.sleep(len(tokens) / self.tokens_per_second)
+        return "".join(tokens), self._usage(request, tokens)
+
+
+BACKEND_TYPES: dict[str, type[LLMBackend]] = {
+    AnthropicBackend.name: AnthropicBackend,
+    OpenAICompatibleBackend.name: OpenAICompatibleBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+_backends: dict[str, LLMBackend] = {}
+
+
+def get_backend(agent_name: str) -> LLMBackend:
+    """Get the backend configured for an agent, wrapped in the active cassette."""
+    from mi_trainer.agents.cassette import CassetteBackend, get_cassette
+
+    backend_name = AGENT_BACKENDS.get(agent_name, AnthropicBackend.name)
+    if backend_name not in BACKEND_TYPES:
+        raise ValueError(
+            f"Unknown backend '{backend_name}' for {agent_name} agent. "
+            f"Choose one of: {', '.join(BACKEND_TYPES)}"
+        )
+
+    cassette = get_cassette()
+    if cassette is not None and not cassette.recording:
+        # Replays never reach the real backend, so don't construct it
+        return CassetteBackend(None, cassette, backend_name)
+
+    backend = _backends.get(backend_name)
+    if backend is None:
+        backend = BACKEND_TYPES[backend_name]()
+        _backends[backend_name] = backend
+
+    if cassette is not None:
+        return CassetteBackend(backend, cassette, backend_name)
+    return backend
+
+
+async def close_backends() -> None:
+    """Close every backend created so far, including the shared Anthropic client."""
+    for backend in _backends.values():
+        await backend.aclose()
+    _backends.clear()
+    await close_clients()
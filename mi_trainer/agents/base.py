@@ -1,51 +1,187 @@
-"""Base agent class with Anthropic client setup."""
+"""Base agent class with LLM backend setup."""
 
+import json
 from pathlib import Path
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Optional, TypeVar
 
-import anthropic
+from pydantic import BaseModel, ValidationError
 
-from mi_trainer.config import get_api_key, DEFAULT_MODEL
+from mi_trainer.agents.backends import LLMBackend, LLMRequest, ToolSpec, get_backend
+from mi_trainer.agents.cache import get_response_cache, request_key
+from mi_trainer.agents.cassette import get_cassette
+from mi_trainer.agents.scheduler import Priority
+from mi_trainer.agents.schemas import field_errors, parse_json_object, tool_for_model
+from mi_trainer.config import DEFAULT_MODEL, STRUCTURED_OUTPUT_REPAIRS
+from mi_trainer.models.usage import TokenUsage
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+REPAIR_TEMPLATE = """Your previous answer was:
+
+{previous}
+
+These fields were missing or invalid:
+{errors}
+
+Call the tool again with corrected values for just these fields."""
 
 
 class BaseAgent:
     """Base class for all LLM agents."""
 
-    def __init__(self, model: str = DEFAULT_MODEL):
-        self.client = anthropic.AsyncAnthropic(api_key=get_api_key())
+    # Key into config.AGENT_BACKENDS choosing this agent's backend
+    agent_name = "base"
+
+    def __init__(self, model: str = DEFAULT_MODEL, backend: Optional[LLMBackend] = None):
+        self.backend = backend or get_backend(self.agent_name)
+        # Cached responses would bypass the cassette, so recording/replaying disables it
+        self.response_cache = None if get_cassette() is not None else get_response_cache()
         self.model = model
+        self.usage = TokenUsage()
 
     def _load_prompt(self, prompt_name: str) -> str:
         """Load a prompt template from the prompts directory."""
         prompt_path = Path(__file__).parent.parent / "prompts" / f"{prompt_name}.md"
         return prompt_path.read_text()
 
-    async def stream_response(
+    def _request(
         self,
         system_prompt: str,
-        messages: list[dict[str, str]],
-    ) -> AsyncIterator[str]:
-        """Stream a response from the model."""
-        async with self.client.messages.stream(
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        priority: Priority,
+        tool: Optional[ToolSpec] = None,
+    ) -> LLMRequest:
+        return LLMRequest(
             model=self.model,
-            max_tokens=1024,
             system=system_prompt,
             messages=messages,
-        ) as stream:
-            async for text in stream.text_stream:
-                yield text
+            max_tokens=max_tokens,
+            priority=priority,
+            agent=self.agent_name,
+            tool=tool,
+        )
+
+    async def stream_response(
+        self,
+        system_prompt: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int = 1024,
+        priority: Priority = Priority.BACKGROUND,
+        tool: Optional[ToolSpec] = None,
+        cached: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream a response from the model (the tool's JSON input, given a tool).
+
+        With `cached=True` a response cached by an identical earlier request
+        is yielded in one piece, an identical request still streaming is
+        joined rather than repeated (see `SharedStream`), and a fully streamed
+        response is cached.
+        """
+        request = self._request(system_prompt, messages, max_tokens, priority, tool)
+        if cached and self.response_cache is not None:
+            key = self._cache_key(request)
+            response = self.response_cache.get(key)
+            if response is not None:
+                self.usage.cached_responses += 1
+                yield response
+                return
+            stream, joined = self.response_cache.share_stream(key, lambda: self._stream(request))
+            if joined:
+                self.usage.cached_responses += 1
+            async for chunk in stream.read():
+                yield chunk
+            return
+
+        async for chunk in self._stream(request):
+            yield chunk
+
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        async for event in self.backend.stream(request):
+            if isinstance(event, TokenUsage):
+                self.usage.record(event)
+            else:
+                yield event
 
     async def get_response(
         self,
         system_prompt: str,
-        messages: list[dict[str, str]],
+        messages: list[dict[str, Any]],
         max_tokens: int = 1024,
+        priority: Priority = Priority.BACKGROUND,
+        cached: bool = False,
+        tool: Optional[ToolSpec] = None,
     ) -> str:
-        """Get a complete response from the model."""
-        response = await self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            system=system_prompt,
-            messages=messages,
+        """Get a complete response from the model (the tool's JSON input, given a tool).
+
+        With `cached=True` the response is served from the disk cache when an
+        identical request has been made before, and concurrent identical
+        requests share a single API call.
+        """
+        request = self._request(system_prompt, messages, max_tokens, priority, tool)
+        if cached and self.response_cache is not None:
+            response, hit = await self.response_cache.get_or_create(
+                self._cache_key(request), lambda: self._complete(request)
+            )
+            if hit:
+                self.usage.cached_responses += 1
+            return response
+
+        return await self._complete(request)
+
+    def _cache_key(self, request: LLMRequest) -> str:
+        return request_key(
+            f"{self.backend.name}:{self.model}",
+            request.system,
+            request.messages,
+            request.max_tokens,
+            request.tool.model_dump() if request.tool else None,
         )
-        return response.content[0].text
+
+    async def _complete(self, request: LLMRequest) -> str:
+        text, usage = await self.backend.complete(request)
+        self.usage.record(usage)
+        return text
+
+    async def validate_structured(
+        self,
+        model_cls: type[ModelT],
+        tool: ToolSpec,
+        response: str | dict[str, Any],
+        system_prompt: str,
+        messages: list[dict[str, Any]],
+        priority: Priority = Priority.BACKGROUND,
+        max_tokens: int = 1024,
+    ) -> ModelT:
+        """Validate tool output against `model_cls`, re-prompting for bad fields.
+
+        Only fields that are missing or fail validation are requested again,
+        with the tool narrowed to just those fields, and the answer is merged
+        into what was already generated. Raises `ValueError` if the output is
+        still invalid after `STRUCTURED_OUTPUT_REPAIRS` attempts.
+        """
+        data = response if isinstance(response, dict) else parse_json_object(response) or {}
+        for _ in range(STRUCTURED_OUTPUT_REPAIRS):
+            errors = field_errors(model_cls, data)
+            if not errors:
+                break
+
+            repair_tool = tool_for_model(model_cls, tool.name, tool.description, errors)
+            repair_messages = messages + [{
+                "role": "user",
+                "content": REPAIR_TEMPLATE.format(
+                    previous=json.dumps(data),
+                    errors="\n".join(f"- {field}: {error}" for field, error in errors.items()),
+                ),
+            }]
+            patch = parse_json_object(
+                await self.get_response(
+                    system_prompt, repair_messages, max_tokens, priority, tool=repair_tool
+                )
+            ) or {}
+            data = {**data, **{field: patch[field] for field in errors if field in patch}}
+
+        try:
+            return model_cls.model_validate(data)
+        except ValidationError as e:
+            raise ValueError(f"Invalid {model_cls.__name__} output: {e}") from e
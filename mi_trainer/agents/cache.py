@@ -0,0 +1,268 @@
+"""Content-addressed disk cache for deterministic agent calls."""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from mi_trainer.config import (
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_TTL,
+    STREAM_ABANDON_DELAY,
+)
+
+
+def request_key(
+    model: str,
+    system_prompt: str,
+    messages: list[dict[str, Any]],
+    max_tokens: int,
+    tool: Optional[dict[str, Any]] = None,
+) -> str:
+    """Hash everything that determines a response into a cache key."""
+    fields = {
+        "model": model,
+        "system": system_prompt,
+        "messages": messages,
+        "max_tokens": max_tokens,
+    }
+    if tool is not None:
+        # Only keyed when present so plain-text requests keep their old keys
+        fields["tool"] = tool
+    payload = json.dumps(
+        fields,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SharedStream:
+    """One streamed response, generated once and read by any number of callers.
+
+    The response is generated in a task of its own, so readers can come and
+    go: one joining late first gets the text so far. When the last reader
+    leaves before the end, generation stops after STREAM_ABANDON_DELAY
+    unless another reader joins.
+    """
+
+    def __init__(self, source: AsyncIterator[str], on_done: Callable[["SharedStream"], None]):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._readers = 0
+        self._loop = asyncio.get_running_loop()
+        self._update = self._loop.create_future()
+        self._on_done = on_done
+        self._task = asyncio.create_task(self._produce(source))
+
+    async def _produce(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in source:
+                self.chunks.append(chunk)
+                self._notify()
+        except BaseException as e:
+            self.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.done = True
+            self._notify()
+            self._on_done(self)
+
+    def _notify(self) -> None:
+        update, self._update = self._update, self._loop.create_future()
+        update.set_result(None)
+
+    async def read(self) -> AsyncIterator[str]:
+        """The response's chunks, from the first; raises if generating it failed."""
+        self._readers += 1
+        try:
+            sent = 0
+            while True:
+                while sent < len(self.chunks):
+                    yield self.chunks[sent]
+                    sent += 1
+                if self.done:
+                    break
+                # Shielded: one reader being cancelled must not wake the others
+                await asyncio.shield(self._update)
+            if self.error is not None:
+                raise self.error
+        finally:
+            self._readers -= 1
+            if not self._readers and not self.done:
+                self._loop.call_later(STREAM_ABANDON_DELAY, self._abandon)
+
+    def _abandon(self) -> None:
+        if not self._readers:
+            self._task.cancel()
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of response texts stored one file per key.
+
+    Entries expire after `ttl` seconds. Identical requests that arrive while
+    one is already in flight wait for its result instead of calling the API;
+    identical streamed requests read the same `SharedStream`.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, ttl: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._index: Optional[OrderedDict[str, int]] = None  # key -> size, oldest first
+        self._total_bytes = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._streams: dict[str, SharedStream] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        """Build the LRU index from the files on disk, ordered by last use."""
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for filepath in self.directory.glob("*.json"):
+                try:
+                    stat = filepath.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, filepath.stem, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _forget(self, key: str) -> None:
+        index = self._load_index()
+        self._total_bytes -= index.pop(key, 0)
+        self._path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for `key`, or None on a miss."""
+        index = self._load_index()
+        if key not in index:
+            return None
+
+        filepath = self._path(key)
+        try:
+            with open(filepath) as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._forget(key)
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl:
+            self._forget(key)
+            return None
+
+        # Mark as recently used, on disk and in memory
+        os.utime(filepath)
+        index.move_to_end(key)
+        return entry["response"]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response and evict least recently used entries over the limit."""
+        index = self._load_index()
+        data = json.dumps({"created_at": time.time(), "response": response})
+
+        filepath = self._path(key)
+        tmp_path = filepath.with_suffix(".tmp")
+        tmp_path.write_text(data)
+        tmp_path.replace(filepath)
+
+        self._total_bytes -= index.pop(key, 0)
+        index[key] = len(data.encode("utf-8"))
+        self._total_bytes += index[key]
+
+        while self._total_bytes > self.max_bytes and len(index) > 1:
+            oldest = next(iter(index))
+            self._forget(oldest)
+
+    async def get_or_create(
+        self,
+        key: str,
+        create: Callable[[], Awaitable[str]],
+    ) -> tuple[str, bool]:
+        """Return `(response, from_cache)`, calling `create` at most once per key.
+
+        Callers that find the same request already in flight share its result
+        and count as cache hits.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending), True
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The caller that started the request was cancelled; take over
+                return await self.get_or_create(key, create)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await create()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve it so an unawaited failure isn't reported as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            self.put(key, response)
+            return response, False
+        finally:
+            del self._inflight[key]
+
+    def share_stream(
+        self,
+        key: str,
+        create: Callable[[], AsyncIterator[str]],
+    ) -> tuple[SharedStream, bool]:
+        """Return `(stream, joined)`: the stream for a key, starting it with `create` if none is in flight.
+
+        A stream that completes is cached as one response.
+        """
+        stream = self._streams.get(key)
+        if stream is not None:
+            return stream, True
+
+        def done(stream: SharedStream) -> None:
+            if self._streams.get(key) is stream:
+                del self._streams[key]
+            if stream.error is None:
+                self.put(key, "".join(stream.chunks))
+
+        stream = SharedStream(create(), done)
+        self._streams[key] = stream
+        return stream, False
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the shared response cache, or None if caching is disabled."""
+    global _cache
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+    return _cache
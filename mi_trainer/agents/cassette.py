@@ -0,0 +1,230 @@
+"""Record and replay agent API traffic for offline, deterministic runs."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Literal, Optional
+
+from mi_trainer.agents.backends import LLMBackend, LLMRequest
+from mi_trainer.agents.cache import request_key
+from mi_trainer.config import CASSETTE_MODE, CASSETTE_PATH, REPLAY_SPEED
+from mi_trainer.models.usage import TokenUsage
+
+CassetteMode = Literal["record", "replay"]
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Cassette:
+    """A file of recorded agent responses, keyed by request hash.
+
+    In record mode every response is appended as it completes, including the
+    arrival time of each streamed chunk. In replay mode responses are served
+    back with their original timing divided by `speed` (0 means no delay).
+    A request recorded several times replays its recordings in order.
+    """
+
+    def __init__(self, path: Path, mode: CassetteMode, speed: float = 1.0):
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        self._interactions: list[dict[str, Any]] = []
+        self._by_key: dict[str, list[dict[str, Any]]] = {}
+        self._replayed: dict[str, int] = {}
+
+        # Recording into an existing cassette extends it
+        if mode == "replay" or self.path.exists():
+            with open(self.path) as f:
+                data = json.load(f)
+            for interaction in data.get("interactions", []):
+                self._add(interaction)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _add(self, interaction: dict[str, Any]) -> None:
+        self._interactions.append(interaction)
+        self._by_key.setdefault(interaction["key"], []).append(interaction)
+
+    def _save(self) -> None:
+        """Write the cassette atomically so a crash never leaves it truncated."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": CASSETTE_VERSION, "interactions": self._interactions}, indent=1)
+        )
+        tmp_path.replace(self.path)
+
+    def _next(self, key: str) -> dict[str, Any]:
+        """Get the next recording for a request key."""
+        recordings = self._by_key.get(key)
+        if not recordings:
+            raise CassetteMissError(f"No recorded response for request {key[:12]} in {self.path}")
+        index = self._replayed.get(key, 0)
+        self._replayed[key] = index + 1
+        return recordings[min(index, len(recordings) - 1)]
+
+    async def _wait_until(self, start: float, offset: float) -> None:
+        """Sleep until `offset` recorded seconds (scaled by speed) after `start`."""
+        if self.speed <= 0:
+            return
+        delay = start + offset / self.speed - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # Recording
+
+    def record_response(
+        self,
+        key: str,
+        agent: str,
+        text: str,
+        usage: TokenUsage,
+        duration: float,
+    ) -> None:
+        """Record a complete (non-streamed) response."""
+        self._add({
+            "key": key,
+            "agent": agent,
+            "kind": "response",
+            "text": text,
+            "usage": _usage_dict(usage),
+            "duration": duration,
+        })
+        self._save()
+
+    def record_stream(
+        self,
+        key: str,
+        agent: str,
+        chunks: list[tuple[float, str]],
+        usage: TokenUsage,
+        duration: float,
+    ) -> None:
+        """Record a streamed response as (seconds since request, text) chunks."""
+        self._add({
+            "key": key,
+            "agent": agent,
+            "kind": "stream",
+            "chunks": [[offset, text] for offset, text in chunks],
+            "usage": _usage_dict(usage),
+            "duration": duration,
+        })
+        self._save()
+
+    # Replay
+
+    async def replay_response(self, key: str) -> tuple[str, TokenUsage]:
+        """Replay a recorded response, returning `(text, usage)`."""
+        start = time.perf_counter()
+        interaction = self._next(key)
+        if interaction["kind"] == "stream":
+            text = "".join(chunk for _, chunk in interaction["chunks"])
+        else:
+            text = interaction["text"]
+        await self._wait_until(start, interaction["duration"])
+        return text, TokenUsage(**interaction["usage"])
+
+    async def replay_stream(self, key: str) -> tuple[AsyncIterator[str], TokenUsage]:
+        """Replay a recorded stream, returning `(chunks, usage)`."""
+        start = time.perf_counter()
+        interaction = self._next(key)
+        if interaction["kind"] == "stream":
+            chunks = interaction["chunks"]
+        else:
+            # Recorded without streaming; deliver it as one chunk
+            chunks = [[interaction["duration"], interaction["text"]]]
+
+        async def stream() -> AsyncIterator[str]:
+            for offset, text in chunks:
+                await self._wait_until(start, offset)
+                yield text
+            await self._wait_until(start, interaction["duration"])
+
+        return stream(), TokenUsage(**interaction["usage"])
+
+
+def _usage_dict(usage: TokenUsage) -> dict[str, int]:
+    """Extract the per-call token counts worth storing."""
+    return usage.model_dump(
+        include={"input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"}
+    )
+
+
+class CassetteBackend(LLMBackend):
+    """Records another backend's responses, or replays them without it.
+
+    Requests are keyed by the real backend's name as well as their content,
+    so the same agent can be recorded against different backends.
+    """
+
+    def __init__(self, inner: Optional[LLMBackend], cassette: Cassette, backend_name: str):
+        self.inner = inner
+        self.cassette = cassette
+        self.name = backend_name
+
+    def _key(self, request: LLMRequest) -> str:
+        return request_key(
+            f"{self.name}:{request.model}",
+            request.system,
+            request.messages,
+            request.max_tokens,
+            request.tool.model_dump() if request.tool else None,
+        )
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[str | TokenUsage]:
+        key = self._key(request)
+        if not self.cassette.recording:
+            chunks, usage = await self.cassette.replay_stream(key)
+            async for text in chunks:
+                yield text
+            yield usage
+            return
+
+        start = time.perf_counter()
+        recorded: list[tuple[float, str]] = []
+        async for event in self.inner.stream(request):
+            if isinstance(event, TokenUsage):
+                self.cassette.record_stream(
+                    key, request.agent, recorded, event, time.perf_counter() - start
+                )
+            else:
+                recorded.append((time.perf_counter() - start, event))
+            yield event
+
+    async def complete(self, request: LLMRequest) -> tuple[str, TokenUsage]:
+        key = self._key(request)
+        if not self.cassette.recording:
+            return await self.cassette.replay_response(key)
+
+        start = time.perf_counter()
+        text, usage = await self.inner.complete(request)
+        self.cassette.record_response(key, request.agent, text, usage, time.perf_counter() - start)
+        return text, usage
+
+
+_cassette: Optional[Cassette] = None
+_configured = False
+
+
+def configure_cassette(path: Optional[Path], mode: CassetteMode = "replay", speed: float = 1.0) -> None:
+    """Route all agents through a cassette (or back to the live API with None).
+
+    Must be called before agents are created.
+    """
+    global _cassette, _configured
+    _cassette = Cassette(path, mode, speed) if path is not None else None
+    _configured = True
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Get the active cassette, configured from the environment by default."""
+    if not _configured:
+        configure_cassette(CASSETTE_PATH, CASSETTE_MODE, REPLAY_SPEED)
+    return _cassette
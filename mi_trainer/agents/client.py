@@ -3,12 +3,15 @@
 from typing import AsyncIterator
 
 from mi_trainer.agents.base import BaseAgent
+from mi_trainer.agents.scheduler import Priority
 from mi_trainer.models.scenario import Scenario
 
 
 class ClientAgent(BaseAgent):
     """Agent that roleplays as a client in MI practice."""
 
+    agent_name = "client"
+
     def __init__(self, scenario: Scenario, **kwargs):
         super().__init__(**kwargs)
         self.scenario = scenario
@@ -29,7 +32,9 @@ class ClientAgent(BaseAgent):
         conversation: list[dict[str, str]],
     ) -> AsyncIterator[str]:
         """Generate a response to the practitioner's message."""
-        async for chunk in self.stream_response(self._system_prompt, conversation):
+        async for chunk in self.stream_response(
+            self._system_prompt, conversation, priority=Priority.CLIENT
+        ):
             yield chunk
 
     async def get_opening(self) -> str:
@@ -45,4 +50,6 @@ class ClientAgent(BaseAgent):
                 "Introduce yourself briefly and share what brings you here today.",
             }
         ]
-        return await self.get_response(self._system_prompt, messages)
+        return await self.get_response(
+            self._system_prompt, messages, priority=Priority.CLIENT, cached=True
+        )
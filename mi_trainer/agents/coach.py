@@ -1,170 +1,314 @@
 """Coach agent for MI feedback."""
 
-import json
-from typing import AsyncIterator
+import asyncio
+from typing import Any, AsyncIterator
 
+from mi_trainer.agents.backends import cache_breakpoint, text_block
 from mi_trainer.agents.base import BaseAgent
-from mi_trainer.models.feedback import CoachFeedback
+from mi_trainer.agents.feedback_parser import FeedbackStreamParser
+from mi_trainer.agents.scheduler import Priority
+from mi_trainer.agents.schemas import parse_json_object, tool_for_model
+from mi_trainer.config import DEBRIEF_CHUNK_MESSAGES, DEBRIEF_MAX_TOKENS
+from mi_trainer.models.conversation import ConversationNode
+from mi_trainer.models.feedback import CoachFeedback, DebriefStats
+
+FEEDBACK_TOOL = tool_for_model(
+    CoachFeedback,
+    "record_feedback",
+    "Record MI coaching feedback on the practitioner's latest message.",
+)
+
+HINT_PROMPT = """You are an MI coach. Based on the conversation so far, suggest what technique or approach the practitioner might try next.
+
+Focus on:
+- Which MI technique would be most helpful here (open question, reflection, affirmation, summary, etc.)
+- Why this technique fits the current moment
+- What aspect of what the client said to focus on
+
+Do NOT provide exact words to say. Give guidance on the approach, not a script.
+
+Keep your response to 2-3 sentences."""
+
+DEBRIEF_CHUNK_PROMPT = """You are an expert MI coach reviewing part of a practice session. The practitioner's turns are followed by the notes the coach gave at the time.
+
+Write 3-6 short bullet points covering:
+- Moments where the practitioner used MI well, with brief quotes
+- Missed opportunities or MI-inconsistent moments, and what might have worked better
+- How the client's change talk and sustain talk shifted in this part
+
+Be specific and concise. These notes will be combined with notes on the rest of the session."""
+
+DEBRIEF_PROMPT = """You are an expert MI coach providing a session debrief. Technique counts have already been computed and will be shown to the practitioner alongside your debrief, so do not repeat them. Base your assessment on the statistics, the notes on earlier parts of the session, and the transcript provided.
+
+Structure your response as follows:
+
+## Overall Assessment
+A 2-3 sentence summary of how the session went overall.
+
+## MI Adherence Score: X/10
+Brief justification for the score.
+
+## Strengths
+2-3 specific things the practitioner did well, with examples from the conversation.
+
+## Areas for Growth
+2-3 specific areas to work on, with concrete suggestions. Reference specific moments where a different approach might have worked better.
+
+## Client Movement
+Analyze how the client's language shifted during the session:
+- Did change talk increase or decrease?
+- Did sustain talk increase or decrease?
+- What seemed to influence these shifts?
+
+## Key Takeaway
+One main thing to focus on for next time.
+
+Be specific, educational, and encouraging. Reference actual quotes from the conversation."""
 
 
 class CoachAgent(BaseAgent):
     """Agent that provides MI coaching feedback."""
 
+    agent_name = "coach"
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._system_prompt = self._load_prompt("coach_system")
 
     async def analyze(
         self,
-        conversation: list[dict[str, str]],
+        transcript: list[str],
         latest_user_message: str,
     ) -> CoachFeedback:
         """Analyze the user's message and provide feedback."""
-        # Build the analysis request
-        analysis_messages = [
-            {
-                "role": "user",
-                "content": self._build_analysis_request(conversation, latest_user_message),
-            }
-        ]
-
-        response = await self.get_response(self._system_prompt, analysis_messages)
-        return self._parse_feedback(response)
+        response = await self.get_response(
+            self._system_prompt,
+            self._analysis_messages(transcript, latest_user_message),
+            priority=Priority.COACH,
+            tool=FEEDBACK_TOOL,
+        )
+        return await self.finish_feedback(response, transcript, latest_user_message)
 
     async def analyze_streaming(
         self,
-        conversation: list[dict[str, str]],
+        transcript: list[str],
         latest_user_message: str,
     ) -> AsyncIterator[str]:
-        """Stream the analysis for display while generating."""
-        analysis_messages = [
+        """Stream the feedback JSON while it is generated.
+
+        Feed the chunks to a `FeedbackStreamParser` for display, then pass the
+        full text to `finish_feedback`.
+        """
+        async for chunk in self.stream_response(
+            self._system_prompt,
+            self._analysis_messages(transcript, latest_user_message),
+            priority=Priority.COACH,
+            tool=FEEDBACK_TOOL,
+        ):
+            yield chunk
+
+    async def finish_feedback(
+        self,
+        response: str,
+        transcript: list[str],
+        latest_user_message: str,
+    ) -> CoachFeedback:
+        """Validate streamed feedback, re-requesting only fields that are missing or invalid."""
+        data = parse_json_object(response)
+        if data is None:
+            # Cut off mid-object: keep whatever fields completed
+            parser = FeedbackStreamParser()
+            parser.feed(response)
+            data = parser.values
+
+        try:
+            return await self.validate_structured(
+                CoachFeedback,
+                FEEDBACK_TOOL,
+                data,
+                self._system_prompt,
+                self._analysis_messages(transcript, latest_user_message),
+                priority=Priority.COACH,
+            )
+        except ValueError:
+            return self._parse_feedback(response)
+
+    def _analysis_messages(
+        self,
+        transcript: list[str],
+        latest_user_message: str,
+    ) -> list[dict[str, Any]]:
+        return [
             {
                 "role": "user",
-                "content": self._build_analysis_request(conversation, latest_user_message),
+                "content": self._build_analysis_request(transcript, latest_user_message),
             }
         ]
 
-        async for chunk in self.stream_response(self._system_prompt, analysis_messages):
-            yield chunk
-
     def _build_analysis_request(
         self,
-        conversation: list[dict[str, str]],
+        transcript: list[str],
         latest_user_message: str,
-    ) -> str:
+    ) -> list[dict[str, Any]]:
         """Build the request for feedback analysis."""
-        # Format conversation history
-        history_text = ""
-        for msg in conversation[:-1]:  # Exclude the latest message
-            role_label = "Practitioner" if msg["role"] == "user" else "Client"
-            history_text += f"{role_label}: {msg['content']}\n\n"
-
-        return f"""## Conversation History
+        # Conversation history, excluding the latest message
+        history = self._history_blocks(transcript[:-1], "## Conversation History\n\n")
 
-{history_text}
+        return history + [
+            text_block(
+                f"""
 
 ## Message to Analyze
 
 Practitioner: {latest_user_message}
 
-Please analyze this practitioner response and provide feedback in the specified JSON format."""
+Please analyze this practitioner response and record your feedback with the tool."""
+            )
+        ]
+
+    def _history_blocks(
+        self,
+        transcript: list[str],
+        heading: str,
+    ) -> list[dict[str, Any]]:
+        """Turn transcript segments into one content block per message.
+
+        Keeping each message in its own block means the transcript prefix is
+        byte-identical from turn to turn, so the cache breakpoint placed after
+        the last message lets the next request reuse it.
+        """
+        blocks = [text_block(heading)]
+        blocks += [text_block(segment) for segment in transcript]
+        blocks[-1] = cache_breakpoint(blocks[-1])
+        return blocks
 
     def _parse_feedback(self, response: str) -> CoachFeedback:
         """Parse the JSON response into a CoachFeedback object."""
-        try:
-            # Try to extract JSON from the response
-            # Handle case where model wraps JSON in markdown code blocks
-            json_str = response
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0]
-
-            data = json.loads(json_str.strip())
-            return CoachFeedback(**data)
-        except (json.JSONDecodeError, IndexError, KeyError) as e:
-            # If parsing fails, return a basic feedback object
-            return CoachFeedback(
-                overall_note=f"Unable to parse feedback: {response[:200]}..."
-            )
-
-    async def get_hint(self, conversation: list[dict[str, str]]) -> str:
+        parser = FeedbackStreamParser()
+        parser.feed(response)
+        if parser.complete:
+            return parser.feedback
+
+        data = parse_json_object(response)
+        if data is not None:
+            try:
+                return CoachFeedback(**data)
+            except ValueError:
+                pass
+
+        # If parsing fails, return a basic feedback object
+        return CoachFeedback(
+            overall_note=f"Unable to parse feedback: {response[:200]}..."
+        )
+
+    async def get_hint(self, transcript: list[str]) -> str:
         """Get a hint about what technique to try next."""
-        # Format conversation history
-        history_text = ""
-        for msg in conversation:
-            role_label = "Practitioner" if msg["role"] == "user" else "Client"
-            history_text += f"{role_label}: {msg['content']}\n\n"
-
-        hint_prompt = """You are an MI coach. Based on the conversation so far, suggest what technique or approach the practitioner might try next.
-
-Focus on:
-- Which MI technique would be most helpful here (open question, reflection, affirmation, summary, etc.)
-- Why this technique fits the current moment
-- What aspect of what the client said to focus on
-
-Do NOT provide exact words to say. Give guidance on the approach, not a script.
-
-Keep your response to 2-3 sentences."""
+        return "".join([chunk async for chunk in self.stream_hint(transcript)])
 
+    async def stream_hint(self, transcript: list[str]) -> AsyncIterator[str]:
+        """Stream a hint about what technique to try next."""
         messages = [
             {
                 "role": "user",
-                "content": f"## Conversation So Far\n\n{history_text}\n\nWhat technique should the practitioner consider using next?",
+                "content": self._history_blocks(transcript, "## Conversation So Far\n\n") + [
+                    text_block("\n\nWhat technique should the practitioner consider using next?")
+                ],
             }
         ]
 
-        return await self.get_response(hint_prompt, messages)
-
-    async def get_debrief(self, conversation: list[dict[str, str]]) -> str:
-        """Get a full session debrief with analysis and feedback."""
-        # Format conversation history
-        history_text = ""
-        for msg in conversation:
-            role_label = "Practitioner" if msg["role"] == "user" else "Client"
-            history_text += f"{role_label}: {msg['content']}\n\n"
-
-        debrief_prompt = """You are an expert MI coach providing a session debrief. Analyze the full conversation and provide comprehensive feedback.
-
-Structure your response as follows:
-
-## Overall Assessment
-A 2-3 sentence summary of how the session went overall.
-
-## MI Adherence Score: X/10
-Brief justification for the score.
-
-## Techniques Used
-Count and list the MI techniques observed:
-- Open questions: [count]
-- Closed questions: [count]
-- Simple reflections: [count]
-- Complex reflections: [count]
-- Affirmations: [count]
-- Summaries: [count]
-
-## Strengths
-2-3 specific things the practitioner did well, with examples from the conversation.
-
-## Areas for Growth
-2-3 specific areas to work on, with concrete suggestions. Reference specific moments where a different approach might have worked better.
+        async for chunk in self.stream_response(
+            HINT_PROMPT, messages, priority=Priority.BACKGROUND, cached=True
+        ):
+            yield chunk
 
-## Client Movement
-Analyze how the client's language shifted during the session:
-- Did change talk increase or decrease?
-- Did sustain talk increase or decrease?
-- What seemed to influence these shifts?
+    async def get_debrief(self, path: list[ConversationNode]) -> str:
+        """Get a full session debrief for the conversation along `path`."""
+        return "".join([chunk async for chunk in self.stream_debrief(path)])
+
+    async def stream_debrief(self, path: list[ConversationNode]) -> AsyncIterator[str]:
+        """Stream a full session debrief for the conversation along `path`.
+
+        Technique counts and MI-consistency tallies come straight from the
+        feedback already stored on each practitioner turn, so they are yielded
+        at once. Full chunks of the session are then analyzed in parallel and
+        cached by content, so a repeated debrief only pays for the turns since
+        the last one; the narrative is streamed from those notes plus the most
+        recent messages.
+        """
+        stats = self.debrief_stats(path)
+        yield f"{stats.to_markdown()}\n\n"
+
+        system_prompt, messages = await self._debrief_request(path, stats)
+        async for chunk in self.stream_response(
+            system_prompt,
+            messages,
+            max_tokens=DEBRIEF_MAX_TOKENS,
+            priority=Priority.BACKGROUND,
+            cached=True,
+        ):
+            yield chunk
 
-## Key Takeaway
-One main thing to focus on for next time.
+    @staticmethod
+    def debrief_stats(path: list[ConversationNode]) -> DebriefStats:
+        """Aggregate the per-turn feedback stored along `path`."""
+        stats = DebriefStats()
+        for node in path:
+            if node.role != "user":
+                continue
+            stats.practitioner_turns += 1
+            if node.coach_feedback is not None:
+                stats.add(node.coach_feedback)
+        return stats
+
+    async def _debrief_request(
+        self,
+        path: list[ConversationNode],
+        stats: DebriefStats,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Build the reduce request, analyzing any full chunks first."""
+        size = max(DEBRIEF_CHUNK_MESSAGES, 2)
+        # Chunk boundaries are fixed from the root so earlier chunks stay cache hits
+        full = len(path) // size * size
+        chunks = [path[i:i + size] for i in range(0, full, size)]
+        notes = await asyncio.gather(*(self._analyze_chunk(chunk) for chunk in chunks))
+
+        request = f"## Session Statistics\n\n{stats.to_markdown()}\n\n"
+        if notes:
+            request += "## Notes on Earlier Parts of the Session\n\n"
+            request += "\n\n".join(
+                f"### Part {i}\n{note.strip()}" for i, note in enumerate(notes, 1)
+            )
+            request += "\n\n"
+        if full < len(path):
+            heading = "## Most Recent Messages" if notes else "## Full Session Transcript"
+            request += f"{heading}\n\n{self._debrief_transcript(path[full:])}"
+        request += "Please write the session debrief."
 
-Be specific, educational, and encouraging. Reference actual quotes from the conversation."""
+        return DEBRIEF_PROMPT, [{"role": "user", "content": request}]
 
+    async def _analyze_chunk(self, nodes: list[ConversationNode]) -> str:
+        """Notes on one chunk of the session, cached by its content (in the response cache)."""
+        excerpt = self._debrief_transcript(nodes)
         messages = [
             {
                 "role": "user",
-                "content": f"## Full Session Transcript\n\n{history_text}\n\nPlease provide a comprehensive session debrief.",
+                "content": f"## Session Excerpt\n\n{excerpt}Please write your notes on this excerpt.",
             }
         ]
-
-        return await self.get_response(debrief_prompt, messages, max_tokens=2048)
+        return await self.get_response(
+            DEBRIEF_CHUNK_PROMPT,
+            messages,
+            max_tokens=400,
+            priority=Priority.BACKGROUND,
+            cached=True,
+        )
+
+    @staticmethod
+    def _debrief_transcript(nodes: list[ConversationNode]) -> str:
+        """Transcript of `nodes` with the coach's per-turn notes inline."""
+        parts = []
+        for node in nodes:
+            parts.append(node.transcript_segment())
+            if node.coach_feedback is not None and node.coach_feedback.overall_note:
+                parts.append(f"(Coach note: {node.coach_feedback.overall_note})\n\n")
+        return "".join(parts)
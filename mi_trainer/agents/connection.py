@@ -0,0 +1,82 @@
+"""Process-wide pooled Anthropic client shared by all agents."""
+
+import asyncio
+from typing import Optional
+
+import anthropic
+import httpx
+
+from mi_trainer.config import (
+    get_api_key,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+)
+
+# One client per API key; every agent using the same key shares its pool
+_clients: dict[str, anthropic.AsyncAnthropic] = {}
+_http_clients: dict[str, httpx.AsyncClient] = {}
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def get_client(api_key: Optional[str] = None) -> anthropic.AsyncAnthropic:
+    """Get the shared Anthropic client, creating it on first use."""
+    key = api_key or get_api_key()
+    client = _clients.get(key)
+    if client is None:
+        http_client = anthropic.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=HTTP_TIMEOUT,
+        )
+        # Retries are handled by the request scheduler, which knows priorities
+        client = anthropic.AsyncAnthropic(api_key=key, http_client=http_client, max_retries=0)
+        _clients[key] = client
+        _http_clients[key] = http_client
+    return client
+
+
+async def _open_connection(key: str) -> None:
+    """Open a pooled connection so the first real request skips the handshake."""
+    client = _clients[key]
+    try:
+        response = await _http_clients[key].head(str(client.base_url))
+        await response.aclose()
+    except httpx.HTTPError:
+        # Warm-up is best effort; the first real request will connect instead
+        pass
+
+
+def warm_up(api_key: Optional[str] = None) -> Optional[asyncio.Task]:
+    """Start opening the shared client's connection in the background.
+
+    Must be called from a running event loop. Returns the background task,
+    or None if no API key is configured.
+    """
+    global _warmup_task
+    try:
+        key = api_key or get_api_key()
+    except ValueError:
+        return None
+
+    get_client(key)
+    if _warmup_task is None or _warmup_task.done():
+        _warmup_task = asyncio.create_task(_open_connection(key))
+    return _warmup_task
+
+
+async def close_clients() -> None:
+    """Close all shared clients and their connection pools."""
+    global _warmup_task
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    _warmup_task = None
+
+    for client in _clients.values():
+        await client.close()
+    _clients.clear()
+    _http_clients.clear()
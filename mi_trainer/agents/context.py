@@ -0,0 +1,115 @@
+"""Bounded context window for the client agent."""
+
+import asyncio
+from typing import Optional
+
+from mi_trainer.agents.summarizer import SummarizerAgent
+from mi_trainer.agents.tokens import estimate_tokens
+from mi_trainer.config import CONTEXT_KEEP_MESSAGES, CONTEXT_MAX_TOKENS, CONTEXT_SUMMARY_BATCH
+from mi_trainer.models.conversation import ConversationNode, ConversationTree
+
+SUMMARY_TEMPLATE = """(Summary of our conversation so far, for context. Continue naturally from the messages that follow.)
+
+{summary}"""
+
+
+class ContextWindow:
+    """Builds client prompts of roughly constant size however long a session runs.
+
+    The most recent `keep_messages` messages are always sent verbatim. Older
+    messages are folded into a running summary stored on the last node it
+    covers, so it is shared by every branch below that node and saved with
+    the session. Summaries are produced in the background after a turn and
+    used from the next turn on.
+    """
+
+    def __init__(
+        self,
+        summarizer: Optional[SummarizerAgent] = None,
+        keep_messages: int = CONTEXT_KEEP_MESSAGES,
+        summary_batch: int = CONTEXT_SUMMARY_BATCH,
+        max_tokens: int = CONTEXT_MAX_TOKENS,
+    ):
+        self._summarizer = summarizer
+        self.keep_messages = keep_messages
+        self.summary_batch = summary_batch
+        self.max_tokens = max_tokens
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def summarizer(self) -> SummarizerAgent:
+        # Created on first use so short sessions never set up its backend
+        if self._summarizer is None:
+            self._summarizer = SummarizerAgent()
+        return self._summarizer
+
+    @staticmethod
+    def _latest_summary(path: list[ConversationNode]) -> tuple[int, Optional[str]]:
+        """Index of the first message after the latest summary, and that summary."""
+        for i in range(len(path) - 1, -1, -1):
+            if path[i].summary is not None:
+                return i + 1, path[i].summary
+        return 0, None
+
+    def build_messages(self, tree: ConversationTree) -> list[dict[str, str]]:
+        """The current path as LLM messages, with summarized turns replaced by the summary."""
+        path = tree.get_path_to_current()
+        start, summary = self._latest_summary(path)
+
+        messages = []
+        if summary:
+            messages.append({"role": "user", "content": SUMMARY_TEMPLATE.format(summary=summary)})
+        messages += [
+            {"role": "assistant" if node.role == "client" else "user", "content": node.content}
+            for node in path[start:]
+        ]
+        return messages
+
+    def _cut_index(self, path: list[ConversationNode], start: int) -> Optional[int]:
+        """Index of the last message to fold into the summary, or None if not due yet."""
+        cut = len(path) - self.keep_messages - 1
+        if cut < start:
+            return None
+
+        pending = cut - start + 1
+        window_tokens = sum(estimate_tokens(node.content) for node in path[start:])
+        if pending < self.summary_batch and window_tokens <= self.max_tokens:
+            return None
+
+        # End the summary on a practitioner message so the verbatim part opens
+        # with the client, keeping roles alternating after the summary message.
+        # If that leaves nothing to fold, the next turn will have a message to spare.
+        if path[cut].role != "user":
+            cut -= 1
+        return cut if cut >= start else None
+
+    async def _summarize(self, path: list[ConversationNode], start: int, cut: int) -> None:
+        previous = path[start - 1].summary if start > 0 else None
+        try:
+            path[cut].summary = await self.summarizer.summarize(previous, path[start:cut + 1])
+        except Exception:
+            # Best effort: the window just stays longer and the next turn retries
+            pass
+
+    def maybe_summarize(self, tree: ConversationTree) -> Optional[asyncio.Task]:
+        """Start folding old messages into the summary in the background, if due.
+
+        At most one summarization runs at a time; a later call catches up.
+        """
+        if self._task is not None and not self._task.done():
+            return None
+
+        path = tree.get_path_to_current()
+        start, _ = self._latest_summary(path)
+        cut = self._cut_index(path, start)
+        if cut is None:
+            return None
+
+        self._task = asyncio.create_task(self._summarize(path, start, cut))
+        return self._task
+
+    def cancel(self) -> None:
+        """Cancel any summarization in progress."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
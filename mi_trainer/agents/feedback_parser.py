@@ -0,0 +1,115 @@
+"""Incremental parser for streamed coach feedback JSON."""
+
+import json
+from typing import Optional
+
+from mi_trainer.models.feedback import CoachFeedback
+
+LIST_FIELDS = ("techniques_used", "mi_consistent", "mi_inconsistent", "suggestions")
+TEXT_FIELDS = ("overall_note",)
+
+
+class _Frame:
+    """An open JSON object or array."""
+
+    __slots__ = ("is_object", "key", "expect_key")
+
+    def __init__(self, is_object: bool, key: Optional[str]):
+        self.is_object = is_object
+        self.key = key  # Current key for objects; owning key for arrays
+        self.expect_key = is_object
+
+
+class FeedbackStreamParser:
+    """Parses coach feedback JSON as it streams in.
+
+    `feed` returns `(field, value)` events as soon as each list item or text
+    field is complete, so feedback can be shown item by item. Anything before
+    the first `{` (prose, a ```json fence) is skipped, as is anything after
+    the object closes. Unknown keys and non-string values are ignored.
+    """
+
+    def __init__(self):
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._buffer: list[str] = []
+        self._values: dict[str, list[str] | str] = {}
+        self.complete = False
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        """Consume a chunk of the response and return newly completed entries."""
+        events: list[tuple[str, str]] = []
+        for ch in chunk:
+            if self.complete:
+                break
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._buffer.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._buffer.append(ch)
+                elif ch == '"':
+                    self._in_string = False
+                    self._on_string("".join(self._buffer), events)
+                else:
+                    self._buffer.append(ch)
+                continue
+
+            if not self._stack:
+                if ch == "{":
+                    self._stack.append(_Frame(True, None))
+                continue
+
+            top = self._stack[-1]
+            if ch == '"':
+                self._in_string = True
+                self._buffer = []
+            elif ch == "{":
+                self._stack.append(_Frame(True, None))
+            elif ch == "[":
+                self._stack.append(_Frame(False, top.key if top.is_object else None))
+            elif ch in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self.complete = True
+            elif ch == "," and top.is_object:
+                top.expect_key = True
+            elif ch == ":" and top.is_object:
+                top.expect_key = False
+        return events
+
+    def _on_string(self, raw: str, events: list[tuple[str, str]]) -> None:
+        """Handle a completed string token."""
+        try:
+            value = json.loads(f'"{raw}"', strict=False)
+        except json.JSONDecodeError:
+            value = raw
+
+        top = self._stack[-1]
+        if top.is_object and top.expect_key:
+            top.key = value
+            return
+
+        depth = len(self._stack)
+        if depth == 1 and top.key in TEXT_FIELDS:
+            self._values[top.key] = value
+            events.append((top.key, value))
+        elif depth == 2 and not top.is_object and top.key in LIST_FIELDS:
+            self._values.setdefault(top.key, []).append(value)
+            events.append((top.key, value))
+
+    @property
+    def values(self) -> dict[str, list[str] | str]:
+        """Fields parsed so far (lists may still be growing)."""
+        return {
+            field: list(value) if isinstance(value, list) else value
+            for field, value in self._values.items()
+        }
+
+    @property
+    def feedback(self) -> CoachFeedback:
+        """Feedback built from everything parsed so far."""
+        return CoachFeedback(**self._values)
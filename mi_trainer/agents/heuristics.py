@@ -0,0 +1,124 @@
+"""Instant local MI classification, used before (or instead of) the LLM coach."""
+
+import re
+from typing import Optional
+
+from mi_trainer.models.feedback import CoachFeedback
+
+PROVISIONAL_NOTE = "Quick check while the coach thinks it over."
+FALLBACK_NOTE = "Quick local check (the coach is slow to respond right now)."
+
+_OPEN_STARTS = re.compile(
+    r"^(what|how|why|tell me|describe|help me understand|in what way|walk me through|"
+    r"when you think about|where)\b",
+    re.IGNORECASE,
+)
+_CLOSED_STARTS = re.compile(
+    r"^(do|does|did|is|are|was|were|can|could|will|would|should|have|has|had|"
+    r"am|may|might|shall|won't|don't|didn't|isn't|aren't)\b",
+    re.IGNORECASE,
+)
+_REFLECTION = re.compile(
+    r"\b(it sounds like|sounds like|it seems|you seem|you feel|you're feeling|you are feeling|"
+    r"you're saying|what i'm hearing|so you|you've been|you're not sure|you wonder|"
+    r"you're worried|you want|you don't want)\b",
+    re.IGNORECASE,
+)
+_COMPLEX_REFLECTION = re.compile(
+    r"\b(part of you|on (the )?one hand|on the other hand|at the same time|and yet|"
+    r"while also|even though|underneath|almost like|as if)\b",
+    re.IGNORECASE,
+)
+_AFFIRMATION = re.compile(
+    r"\b(you've (really |already )?(done|managed|shown|made|worked)|it takes (courage|strength)|"
+    r"that shows|you really care|i appreciate|you're clearly|that's a (real )?strength|"
+    r"good for you|you did)\b",
+    re.IGNORECASE,
+)
+_SUMMARY = re.compile(
+    r"\b(let me (summarize|see if i've got)|to sum up|so far you've|"
+    r"let me make sure i understand|you've told me)\b",
+    re.IGNORECASE,
+)
+_RIGHTING_REFLEX = re.compile(
+    r"\b(you should|you need to|you have to|you must|you ought to|have you tried|"
+    r"why don't you|why not just|the best thing|i think you should|i'd recommend|"
+    r"my advice|it's important that you|if i were you)\b",
+    re.IGNORECASE,
+)
+_CONFRONTATION = re.compile(
+    r"\b(you're in denial|you're just|that's not true|you're wrong|you can't keep|"
+    r"you know that's|that's an excuse)\b",
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"[a-z']+")
+_STOPWORDS = frozenset(
+    "i you it the a an and or but so to of in on for with that this is are was my me "
+    "your just really not be do have what it's i'm".split()
+)
+
+
+def _sentences(text: str) -> list[str]:
+    return [s.strip() for s in re.split(r"(?<=[.?!])\s+", text.strip()) if s.strip()]
+
+
+def _content_words(text: str) -> set[str]:
+    return {w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS and len(w) > 2}
+
+
+def classify_message(message: str, client_message: Optional[str] = None) -> CoachFeedback:
+    """Label a practitioner message with MI techniques using surface patterns.
+
+    `client_message` is what the client said just before, used to spot
+    reflections that echo the client's own words. This is a rough first
+    pass: it runs in microseconds, but cannot judge tone or accuracy.
+    """
+    techniques: list[str] = []
+    consistent: list[str] = []
+    inconsistent: list[str] = []
+    suggestions: list[str] = []
+
+    questions = [s for s in _sentences(message) if s.endswith("?")]
+    open_questions = [q for q in questions if _OPEN_STARTS.match(q)]
+    closed_questions = [q for q in questions if _CLOSED_STARTS.match(q) and q not in open_questions]
+    if open_questions:
+        techniques.append("open_question")
+        consistent.append("Open question invites the client to elaborate")
+    if closed_questions:
+        techniques.append("closed_question")
+        if not open_questions:
+            suggestions.append("Try rephrasing as an open question starting with 'what' or 'how'")
+    if len(questions) > 2:
+        inconsistent.append("Several questions at once can feel like an interrogation")
+
+    statements = " ".join(s for s in _sentences(message) if not s.endswith("?"))
+    echoed = _content_words(statements) & _content_words(client_message or "")
+    if _COMPLEX_REFLECTION.search(statements):
+        techniques.append("complex_reflection")
+        consistent.append("Reflection goes beyond the client's words")
+    elif _REFLECTION.search(statements) or len(echoed) >= 2:
+        techniques.append("simple_reflection")
+        consistent.append("Reflects back what the client said")
+
+    if _AFFIRMATION.search(message):
+        techniques.append("affirmation")
+        consistent.append("Affirms the client's strengths or efforts")
+    if _SUMMARY.search(message):
+        techniques.append("summary")
+
+    if _RIGHTING_REFLEX.search(message):
+        inconsistent.append("Advice or direction without permission (righting reflex)")
+        suggestions.append("Ask what the client thinks might help before offering ideas")
+    if _CONFRONTATION.search(message):
+        inconsistent.append("Confrontational phrasing may increase resistance")
+
+    if not techniques and not inconsistent:
+        suggestions.append("Consider a reflection of what the client just said")
+
+    return CoachFeedback(
+        techniques_used=techniques,
+        mi_consistent=consistent,
+        mi_inconsistent=inconsistent,
+        suggestions=suggestions,
+        overall_note=PROVISIONAL_NOTE,
+    )
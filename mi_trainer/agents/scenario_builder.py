@@ -1,14 +1,22 @@
 """Scenario builder agent for generating client profiles."""
 
-import json
-
 from mi_trainer.agents.base import BaseAgent
+from mi_trainer.agents.scheduler import Priority
+from mi_trainer.agents.schemas import parse_json_object, tool_for_model
 from mi_trainer.models.scenario import Scenario
 
+SCENARIO_TOOL = tool_for_model(
+    Scenario,
+    "create_scenario",
+    "Create a client scenario for MI practice.",
+)
+
 
 class ScenarioBuilderAgent(BaseAgent):
     """Agent that generates full scenarios from short descriptions."""
 
+    agent_name = "scenario_builder"
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._system_prompt = self._load_prompt("scenario_builder")
@@ -22,20 +30,27 @@ class ScenarioBuilderAgent(BaseAgent):
             }
         ]
 
-        response = await self.get_response(self._system_prompt, messages)
-        return self._parse_scenario(response)
-
-    def _parse_scenario(self, response: str) -> Scenario:
-        """Parse the JSON response into a Scenario object."""
-        try:
-            # Handle markdown code blocks
-            json_str = response
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0]
-
-            data = json.loads(json_str.strip())
-            return Scenario(**data)
-        except (json.JSONDecodeError, IndexError, KeyError) as e:
-            raise ValueError(f"Failed to parse scenario response: {e}\n\nResponse: {response[:500]}")
+        response = await self.get_response(
+            self._system_prompt,
+            messages,
+            max_tokens=2048,
+            priority=Priority.BACKGROUND,
+            cached=True,
+            tool=SCENARIO_TOOL,
+        )
+        return await self._parse_scenario(response, messages)
+
+    async def _parse_scenario(self, response: str, messages: list[dict]) -> Scenario:
+        """Validate the tool output, re-requesting any missing or invalid fields."""
+        data = parse_json_object(response)
+        if data is None:
+            raise ValueError(f"Failed to parse scenario response: {response[:500]}")
+
+        return await self.validate_structured(
+            Scenario,
+            SCENARIO_TOOL,
+            data,
+            self._system_prompt,
+            messages,
+            priority=Priority.BACKGROUND,
+        )
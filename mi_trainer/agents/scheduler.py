@@ -0,0 +1,264 @@
+"""Rate-limit-aware scheduling of agent API calls."""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from enum import IntEnum
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import anthropic
+
+from mi_trainer.config import (
+    API_MAX_RETRIES,
+    COACH_BREAKER_COOLDOWN,
+    COACH_BREAKER_TRIPS,
+    COACH_SLOW_SECONDS,
+    RATE_LIMIT_REQUESTS_PER_MINUTE,
+    RATE_LIMIT_TOKENS_PER_MINUTE,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: timeouts, conflicts, rate limits, server errors, overload
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class Priority(IntEnum):
+    """Scheduling priority of an agent call; lower values go first."""
+
+    CLIENT = 0  # Client replies keep the conversation moving
+    COACH = 1  # Per-turn coach feedback
+    BACKGROUND = 2  # Hints, debriefs, scenario generation
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self._rate = per_minute / 60.0
+        self._level = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        """A zero or negative limit disables the bucket."""
+        return self.capacity <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def delay_for(self, amount: int) -> float:
+        """Seconds until `amount` can be taken (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._level >= amount:
+            return 0.0
+        return (amount - self._level) / self._rate
+
+    def take(self, amount: int) -> None:
+        """Remove `amount` from the bucket; the level may go negative."""
+        if self.unlimited:
+            return
+        self._refill()
+        self._level -= min(amount, self.capacity)
+
+    def give_back(self, amount: int) -> None:
+        """Correct an earlier estimate (negative amounts charge extra)."""
+        if self.unlimited:
+            return
+        self._refill()
+        self._level = min(self.capacity, self._level + amount)
+
+
+class RequestScheduler:
+    """Admits agent calls in priority order within request and token limits.
+
+    Callers `acquire` a slot before each API call. Waiters are served strictly
+    by priority, then arrival order, so a client reply queued behind a debrief
+    still goes out first once the buckets allow it. Rate-limit responses pause
+    all admissions for the server's `retry-after` period.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = RATE_LIMIT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = RATE_LIMIT_TOKENS_PER_MINUTE,
+        max_retries: int = API_MAX_RETRIES,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+    ):
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+        self._blocked_until = 0.0
+
+    def _ready_in(self, tokens: int) -> float:
+        """Seconds until a request of `tokens` may be admitted."""
+        blocked = max(0.0, self._blocked_until - time.monotonic())
+        return max(blocked, self._requests.delay_for(1), self._tokens.delay_for(tokens))
+
+    async def acquire(self, priority: Priority, tokens: int) -> None:
+        """Wait for this call's turn and charge it against the limits."""
+        entry = (int(priority), next(self._seq))
+        async with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    delay = None
+                    if self._waiters[0] == entry:
+                        delay = self._ready_in(tokens)
+                        if delay <= 0:
+                            heapq.heappop(self._waiters)
+                            self._requests.take(1)
+                            self._tokens.take(tokens)
+                            self._cond.notify_all()
+                            return
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the real input token count is known."""
+        self._tokens.give_back(estimated - actual)
+
+    def retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying after `error`, or None to give up."""
+        if attempt >= self.max_retries:
+            return None
+
+        if isinstance(error, anthropic.APIStatusError):
+            if error.status_code not in RETRYABLE_STATUS_CODES:
+                return None
+            retry_after = _retry_after(error)
+        elif isinstance(error, anthropic.APIConnectionError):
+            retry_after = None
+        else:
+            return None
+
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.base_delay)
+        else:
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+        if isinstance(error, anthropic.APIStatusError) and error.status_code in (429, 529):
+            # Everyone shares the limit, so hold back all queued calls too
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+    async def run(
+        self,
+        priority: Priority,
+        tokens: int,
+        request: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run a non-streaming request under the limits, retrying transient errors."""
+        attempt = 0
+        while True:
+            await self.acquire(priority, tokens)
+            try:
+                return await request()
+            except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+
+
+def _retry_after(error: anthropic.APIStatusError) -> Optional[float]:
+    """Read the server's requested wait from the response headers."""
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+class CircuitBreaker:
+    """Stops calling a slow or failing service for a while.
+
+    After `trips` consecutive calls that fail or take longer than
+    `slow_seconds`, the breaker opens and `allow()` returns False for
+    `cooldown` seconds. After that a single trial call is let through;
+    if it is fast the breaker closes, otherwise it opens again.
+    """
+
+    def __init__(
+        self,
+        slow_seconds: float = COACH_SLOW_SECONDS,
+        trips: int = COACH_BREAKER_TRIPS,
+        cooldown: float = COACH_BREAKER_COOLDOWN,
+    ):
+        self.slow_seconds = slow_seconds
+        self.trips = trips
+        self.cooldown = cooldown
+        self._strikes = 0
+        self._open_until = 0.0
+        self._trial_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def allow(self) -> bool:
+        """Whether the next call should go to the service."""
+        now = time.monotonic()
+        if now < self._open_until or now < self._trial_until:
+            return False
+        if self._open_until:
+            # Cooldown over: let one trial call through (a lost trial expires)
+            self._trial_until = now + self.slow_seconds
+        return True
+
+    def record(self, seconds: float) -> None:
+        """Record a call that responded after `seconds`."""
+        if seconds > self.slow_seconds:
+            self.record_failure()
+        else:
+            self._strikes = 0
+            self._open_until = 0.0
+            self._trial_until = 0.0
+
+    def record_failure(self) -> None:
+        """Record a call that failed or was too slow."""
+        self._strikes += 1
+        if self._trial_until or self._strikes >= self.trips:
+            self._open_until = time.monotonic() + self.cooldown
+            self._trial_until = 0.0
+
+
+_scheduler: Optional[RequestScheduler] = None
+
+
+def get_scheduler() -> RequestScheduler:
+    """Get the process-wide scheduler shared by all agents."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RequestScheduler()
+    return _scheduler
@@ -0,0 +1,75 @@
+"""Tool schemas generated from pydantic models, and validation of their output."""
+
+import json
+from typing import Any, Iterable, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from mi_trainer.agents.backends import ToolSpec
+
+
+def _inline_refs(schema: Any, defs: dict[str, Any]) -> Any:
+    """Replace `$ref`s into `$defs` with the definitions themselves."""
+    if isinstance(schema, dict):
+        if "$ref" in schema:
+            # Keep siblings of the reference, such as the field's description
+            siblings = {key: value for key, value in schema.items() if key != "$ref"}
+            return {**_inline_refs(defs[schema["$ref"].split("/")[-1]], defs), **siblings}
+        return {key: _inline_refs(value, defs) for key, value in schema.items() if key != "$defs"}
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    return schema
+
+
+def tool_for_model(
+    model_cls: type[BaseModel],
+    name: str,
+    description: str,
+    fields: Optional[Iterable[str]] = None,
+) -> ToolSpec:
+    """Build a tool whose input is `model_cls`, optionally limited to some fields.
+
+    Every included field is required, so the model fills in defaults
+    explicitly rather than leaving them out. References are inlined because
+    not every backend resolves `$defs`.
+    """
+    schema = model_cls.model_json_schema()
+    properties = _inline_refs(schema["properties"], schema.get("$defs", {}))
+    if fields is not None:
+        properties = {field: properties[field] for field in fields}
+    return ToolSpec(
+        name=name,
+        description=description,
+        input_schema={"type": "object", "properties": properties, "required": list(properties)},
+    )
+
+
+def parse_json_object(text: str) -> Optional[dict[str, Any]]:
+    """Parse a JSON object, tolerating a surrounding markdown code fence."""
+    json_str = text
+    if "```json" in text:
+        json_str = text.split("```json")[1].split("```")[0]
+    elif "```" in text:
+        json_str = text.split("```")[1].split("```")[0]
+
+    try:
+        data = json.loads(json_str.strip())
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def field_errors(model_cls: type[BaseModel], data: dict[str, Any]) -> dict[str, str]:
+    """Top-level fields of `model_cls` that are missing from `data` or invalid.
+
+    Returns a message per field, suitable for asking the model to fix them.
+    """
+    errors = {name: "missing" for name in model_cls.model_fields if name not in data}
+    try:
+        model_cls.model_validate(data)
+    except ValidationError as e:
+        for error in e.errors():
+            field = error["loc"][0] if error["loc"] else None
+            if field in model_cls.model_fields and field not in errors:
+                errors[field] = error["msg"]
+    return errors
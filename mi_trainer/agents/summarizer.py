@@ -0,0 +1,36 @@
+"""Summarizer agent for folding old conversation turns into a running summary."""
+
+from typing import Optional
+
+from mi_trainer.agents.base import BaseAgent
+from mi_trainer.agents.scheduler import Priority
+from mi_trainer.models.conversation import ConversationNode
+
+
+class SummarizerAgent(BaseAgent):
+    """Agent that maintains a running summary of a conversation."""
+
+    agent_name = "summarizer"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._system_prompt = self._load_prompt("context_summary")
+
+    async def summarize(
+        self,
+        previous_summary: Optional[str],
+        nodes: list[ConversationNode],
+    ) -> str:
+        """Fold `nodes` into `previous_summary` and return the updated summary."""
+        transcript = "".join(node.transcript_segment() for node in nodes)
+
+        request = ""
+        if previous_summary:
+            request += f"## Previous Summary\n\n{previous_summary}\n\n"
+        request += f"## New Messages\n\n{transcript}Please return the updated summary."
+
+        messages = [{"role": "user", "content": request}]
+        response = await self.get_response(
+            self._system_prompt, messages, max_tokens=512, priority=Priority.BACKGROUND, cached=True
+        )
+        return response.strip()
@@ -0,0 +1,24 @@
+"""Local token estimation for requests we have not sent yet."""
+
+from typing import Any
+
+# Rough average for English prose with Claude's tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def estimate_message_tokens(message: dict[str, Any]) -> int:
+    """Estimate the tokens in one message, whether its content is a string or blocks."""
+    content = message["content"]
+    if isinstance(content, str):
+        return estimate_tokens(content)
+    return sum(estimate_tokens(block.get("text", "")) for block in content)
+
+
+def estimate_request_tokens(system_prompt: str, messages: list[dict[str, Any]]) -> int:
+    """Estimate the input tokens of a whole request."""
+    return estimate_tokens(system_prompt) + sum(estimate_message_tokens(m) for m in messages)
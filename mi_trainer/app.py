@@ -1,8 +1,10 @@
 """Main application orchestration."""
 
 import asyncio
-from datetime import datetime
-from typing import Optional
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Optional
 
 from prompt_toolkit import Application
 from prompt_toolkit.enums import EditingMode
@@ -11,11 +13,22 @@ from prompt_toolkit.key_binding.bindings.focus import focus_next, focus_previous
 from prompt_toolkit.patch_stdout import patch_stdout
 
 from mi_trainer.agents import ClientAgent, CoachAgent, ScenarioBuilderAgent
-from mi_trainer.models import Scenario, ConversationTree
+from mi_trainer.agents.backends import close_backends
+from mi_trainer.agents.cassette import get_cassette
+from mi_trainer.agents.connection import warm_up
+from mi_trainer.agents.context import ContextWindow
+from mi_trainer.agents.feedback_parser import LIST_FIELDS, FeedbackStreamParser
+from mi_trainer.agents.heuristics import FALLBACK_NOTE, classify_message
+from mi_trainer.agents.scheduler import CircuitBreaker
+from mi_trainer.config import ASIDE_TIMEOUT, CLIENT_TIMEOUT, COACH_TIMEOUT, SESSION_PAGE_SIZE
+from mi_trainer.models import Scenario, ConversationNode, ConversationTree
 from mi_trainer.models.feedback import CoachFeedback
-from mi_trainer.storage.sessions import Session, create_session, save_session, load_session, list_sessions
-from mi_trainer.storage.scenarios import list_all_scenarios, load_scenario_by_name, save_user_scenario
+from mi_trainer.models.usage import LatencyStats
+from mi_trainer.storage import aio as storage
+from mi_trainer.storage.sessions import Session, SessionJournal, create_session
+from mi_trainer.turns import TurnSupervisor
 from mi_trainer.ui.layout import AppLayout
+from mi_trainer.ui.render import RenderScheduler
 
 
 class MITrainerApp:
@@ -23,12 +36,16 @@ class MITrainerApp:
 
     def __init__(self):
         self.session: Optional[Session] = None
+        # Agents using the Anthropic backend share one pooled client (see agents.connection)
         self.client_agent: Optional[ClientAgent] = None
         self.coach_agent = CoachAgent()
         self.scenario_builder = ScenarioBuilderAgent()
+        self.context_window = ContextWindow()
+        self.coach_breaker = CircuitBreaker()
 
         # UI
         self.layout = AppLayout(on_input=self._handle_input)
+        self.layout.feedback_pane.history = self._feedback_history
 
         # Key bindings
         self.kb = self._create_key_bindings()
@@ -42,9 +59,19 @@ class MITrainerApp:
             full_screen=True,
             mouse_support=True,
         )
+        # Streams request repaints through this instead of invalidating per chunk
+        self.render = RenderScheduler(self.app)
 
         # State
         self._running = True
+        self.turns = TurnSupervisor(self._handle_message, on_error=self._show_turn_error)
+        # Autosaves the session: every change is journaled as it happens
+        self.journal: Optional[SessionJournal] = None
+        # Loading the whole tree of a session opened with just its current path
+        self._loading: Optional[asyncio.Task] = None
+        # Filters of the last /load listing, which /load <number> refers to
+        self._session_filter: dict = {}
+        self.latency = LatencyStats()
 
     def _create_key_bindings(self) -> KeyBindings:
         """Create application key bindings."""
@@ -68,26 +95,26 @@ class MITrainerApp:
         @kb.add("c-up")
         def scroll_conv_up(event):
             """Scroll conversation pane up."""
-            self.layout.conversation_pane.container.vertical_scroll -= 3
+            self.layout.conversation_pane.scroll(-3)
 
         @kb.add("pagedown")
         @kb.add("c-down")
         def scroll_conv_down(event):
             """Scroll conversation pane down."""
-            self.layout.conversation_pane.container.vertical_scroll += 3
+            self.layout.conversation_pane.scroll(3)
 
         # Scroll feedback pane (with shift modifier)
         @kb.add("s-pageup")
         @kb.add("s-up")
         def scroll_feedback_up(event):
             """Scroll feedback pane up."""
-            self.layout.feedback_pane.container.vertical_scroll -= 3
+            self.layout.feedback_pane.scroll(-3)
 
         @kb.add("s-pagedown")
         @kb.add("s-down")
         def scroll_feedback_down(event):
             """Scroll feedback pane down."""
-            self.layout.feedback_pane.container.vertical_scroll += 3
+            self.layout.feedback_pane.scroll(3)
 
         return kb
 
@@ -98,31 +125,110 @@ class MITrainerApp:
 
     async def run(self, scenario: Optional[Scenario] = None, load_path: Optional[str] = None) -> None:
         """Run the application."""
+        # Open the API connection while the session is being set up
+        cassette = get_cassette()
+        if cassette is None or cassette.recording:
+            warm_up()
+
         # Initialize session
         if load_path:
-            self.session = load_session(load_path)
-            self.layout.conversation_pane.load_conversation(self.session.conversation)
+            await self._open_session(Path(load_path))
             self.layout.feedback_pane.show_info(f"Loaded session: {self.session.scenario.name}")
         elif scenario:
+            self._cancel_turns()
+            self._set_client_scenario(scenario)
             self.session = create_session(scenario)
+            await self._start_journal()
         else:
             # Show scenario selection
             await self._show_scenario_selection()
 
         if self.session:
-            self.client_agent = ClientAgent(self.session.scenario)
             self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
 
             # Get opening if conversation is empty
             if self.session.conversation.is_empty():
-                await self._get_client_opening()
+                # The opening is added to the whole tree, not the partial one
+                await self._wait_loaded()
+                if self.session is not None:
+                    await self._get_client_opening()
 
         # Run the application
-        await self.app.run_async()
+        try:
+            await self.app.run_async()
+        finally:
+            if self._loading is not None:
+                self._loading.cancel()
+            await self._close_journal()
+            await close_backends()
+
+    async def _open_session(self, path: Path) -> None:
+        """Show a saved session's current path now and load the rest in the background.
+
+        Only the messages on the path are read before the session is shown.
+        The whole tree replaces it once loaded, and journaling starts then;
+        input waits for that (see `_wait_loaded`), so nothing is ever changed
+        in the partial tree.
+        """
+        # Stop the old session's turns before they can touch the partial tree
+        self._cancel_turns()
+        # Let the current session's journal finish before reading files
+        await self._close_journal()
+        self.session = await storage.load_session_path(path)
+        self._set_client_scenario(self.session.scenario)
+        self.layout.conversation_pane.load_conversation(self.session.conversation)
+        self._loading = asyncio.create_task(self._load_rest(path))
+
+    async def _load_rest(self, path: Path) -> None:
+        """Replace a session opened with `_open_session` with the whole tree."""
+        try:
+            self.session = await storage.load_session(path)
+        except (OSError, ValueError) as e:
+            self.session = None
+            self.layout.conversation_pane.clear()
+            self.layout.feedback_pane.show_error(f"Failed to load session: {e}")
+            self.layout.set_status("No session | /help for commands")
+            return
+        await self._start_journal(path)
+        # The path is already shown, so this only adds the branch indicator
+        self.layout.conversation_pane.load_conversation(self.session.conversation)
+        self.render.request()
+
+    async def _wait_loaded(self) -> None:
+        """Wait until the whole tree of an opened session is loaded."""
+        if self._loading is not None:
+            await asyncio.shield(self._loading)
+            self._loading = None
+
+    async def _start_journal(self, path: Optional[Path] = None) -> None:
+        """Journal every change to the current session from now on."""
+        await self._close_journal()
+        self.journal = SessionJournal(self.session, path)
+
+    async def _close_journal(self) -> None:
+        """Write out the current session's journal and stop journaling."""
+        if self.journal is not None:
+            journal, self.journal = self.journal, None
+            await storage.run_io(journal.close)
+
+    def _cancel_turns(self) -> None:
+        """Stop the turn in progress and any summary being written for it."""
+        self.turns.cancel()
+        self.context_window.cancel()
+
+    def _set_client_scenario(self, scenario: Scenario) -> None:
+        """Point the client agent at a scenario, reusing the existing agent.
+
+        Callers stop the old scenario's turns first (see `_cancel_turns`).
+        """
+        if self.client_agent is None:
+            self.client_agent = ClientAgent(scenario)
+        else:
+            self.client_agent.update_scenario(scenario)
 
     async def _show_scenario_selection(self) -> None:
         """Show scenario selection interface."""
-        scenarios = list_all_scenarios()
+        scenarios = await storage.list_all_scenarios()
 
         if not scenarios:
             self.layout.feedback_pane.show_info(
@@ -147,20 +253,38 @@ class MITrainerApp:
 
         opening = await self.client_agent.get_opening()
         self.layout.conversation_pane.finish_streaming()
-        self.layout.conversation_pane.add_message("client", opening)
 
         # Add to conversation tree
-        self.session.conversation.add_message("client", opening)
+        node = self.session.conversation.add_message("client", opening)
+        self.layout.conversation_pane.add_message("client", opening, node.id)
 
         self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
-        self.app.invalidate()
+        self.render.request()
 
     async def _process_input(self, text: str) -> None:
         """Process user input."""
+        await self._wait_loaded()
         if text.startswith("/"):
             await self._handle_command(text)
-        else:
-            await self._handle_message(text)
+        elif self.turns.submit(text):
+            self.layout.set_status("Message queued until the client finishes replying...")
+            self.render.request()
+
+    def _feedback_history(self) -> list[tuple[str, CoachFeedback]]:
+        """Coach feedback on the current path, for the feedback pane's scrollback."""
+        if not self.session:
+            return []
+        return [
+            (node.content, node.coach_feedback)
+            for node in self.session.conversation.get_path_to_current()
+            if node.role == "user" and node.coach_feedback is not None
+        ]
+
+    def _show_turn_error(self, error: Exception) -> None:
+        self.layout.feedback_pane.show_error(f"Turn failed: {error}")
+        if self.session:
+            self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
+        self.render.request()
 
     async def _handle_command(self, text: str) -> None:
         """Handle a slash command."""
@@ -180,6 +304,7 @@ class MITrainerApp:
             "rewind": self._cmd_rewind,
             "branches": self._cmd_branches,
             "goto": self._cmd_goto,
+            "stats": self._cmd_stats,
         }
 
         handler = handlers.get(command)
@@ -188,7 +313,7 @@ class MITrainerApp:
         else:
             self.layout.feedback_pane.show_error(f"Unknown command: {command}")
 
-        self.app.invalidate()
+        self.render.request()
 
     async def _handle_message(self, text: str) -> None:
         """Handle a conversation message."""
@@ -196,69 +321,163 @@ class MITrainerApp:
             self.layout.feedback_pane.show_error("No active session. Use /scenario to start.")
             return
 
+        started = time.perf_counter()
+
         # Add user message to tree
-        self.session.conversation.add_message("user", text)
-        self.layout.conversation_pane.add_message("user", text)
+        previous = self.session.conversation.get_current_node()
+        client_message = previous.content if previous and previous.role == "client" else None
+        user_node = self.session.conversation.add_message("user", text)
+        self.layout.conversation_pane.add_message("user", text, user_node.id)
 
-        # Get conversation history for LLM
-        conversation = self.session.conversation.get_conversation_for_llm()
+        # The coach reads the cached transcript; the client sees a bounded window
+        transcript = self.session.conversation.get_transcript()
+        client_messages = self.context_window.build_messages(self.session.conversation)
 
         # Run coach and client in parallel
         self.layout.set_status("Processing...")
-        self.app.invalidate()
+        self.render.request()
 
         # Start both tasks
-        coach_task = asyncio.create_task(self._run_coach(conversation, text))
-        client_task = asyncio.create_task(self._run_client(conversation))
+        coach_task = asyncio.create_task(
+            self._run_coach(transcript, text, client_message, started)
+        )
+        client_task = asyncio.create_task(self._run_client(client_messages, started))
 
-        # Wait for both to complete
-        feedback, client_response = await asyncio.gather(coach_task, client_task)
+        # Wait for both to complete; if either fails, the other must not outlive the turn
+        try:
+            feedback, client_response = await asyncio.gather(coach_task, client_task)
+        except BaseException as e:
+            coach_task.cancel()
+            client_task.cancel()
+            await asyncio.gather(coach_task, client_task, return_exceptions=True)
+            if not isinstance(e, asyncio.CancelledError) and client_task.cancelled():
+                self._step_back(user_node)
+            raise
+
+        if client_response is None and user_node.parent_id is not None:
+            # The client failed: the resent message replaces this one
+            self._step_back(user_node)
+        else:
+            # Store feedback on the user's node
+            user_node.coach_feedback = feedback
 
-        # Store feedback on the user's node
-        current = self.session.conversation.get_current_node()
-        if current and current.role == "client":
-            # Get the user's node (parent of current)
-            path = self.session.conversation.get_path_to_current()
-            if len(path) >= 2:
-                user_node = path[-2]
-                user_node.coach_feedback = feedback
+        # Fold old turns into the client's running summary before the next turn
+        self.context_window.maybe_summarize(self.session.conversation)
 
+        self.latency.record("turn_total", time.perf_counter() - started)
         self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
-        self.app.invalidate()
+        self.render.request()
 
-    async def _run_coach(self, conversation: list[dict], user_message: str) -> CoachFeedback:
-        """Run the coach agent and update UI."""
-        self.layout.feedback_pane.start_streaming()
-
-        full_response = ""
-        async for chunk in self.coach_agent.analyze_streaming(conversation, user_message):
-            full_response += chunk
-            self.layout.feedback_pane.append_streaming(chunk)
-            self.app.invalidate()
+    def _step_back(self, user_node: ConversationNode) -> None:
+        """Make the parent of an unanswered message current, so a resent message replaces it."""
+        if user_node.parent_id is not None and self.session.conversation.current_id == user_node.id:
+            self.session.conversation.goto(user_node.parent_id)
+            self.layout.conversation_pane.load_conversation(self.session.conversation)
 
-        self.layout.feedback_pane.finish_streaming()
+    async def _run_coach(
+        self,
+        transcript: list[str],
+        user_message: str,
+        client_message: Optional[str],
+        started: float,
+    ) -> CoachFeedback:
+        """Show quick local feedback, then replace it with the coach's as it streams in.
+
+        While the coach's circuit breaker is open (the API has been slow or
+        failing) the local feedback is all there is.
+        """
+        pane = self.layout.feedback_pane
+        provisional = classify_message(user_message, client_message)
+        if not self.coach_breaker.allow():
+            provisional.overall_note = FALLBACK_NOTE
+            pane.show_feedback(provisional)
+            self.render.request()
+            return provisional
+
+        pane.show_provisional(provisional)
+        self.render.request()
+        parser = FeedbackStreamParser()
 
-        # Parse the response into structured feedback
-        feedback = self.coach_agent._parse_feedback(full_response)
-        self.layout.feedback_pane.show_feedback(feedback)
-        self.app.invalidate()
+        full_response = ""
+        try:
+            async with asyncio.timeout(COACH_TIMEOUT):
+                async for chunk in self.coach_agent.analyze_streaming(transcript, user_message):
+                    if not full_response:
+                        first_chunk = time.perf_counter() - started
+                        self.latency.record("coach_first_chunk", first_chunk)
+                        self.coach_breaker.record(first_chunk)
+                        pane.clear_provisional()
+                        pane.start_feedback()
+                    full_response += chunk
+                    for field, value in parser.feed(chunk):
+                        pane.add_feedback_item(field, value)
+                    self.render.request()
+                if not full_response:
+                    raise ValueError("Empty response from coach")
+                # Validation may re-request missing fields
+                feedback = await self.coach_agent.finish_feedback(
+                    full_response, transcript, user_message
+                )
+        except Exception as e:
+            if full_response and not isinstance(e, TimeoutError):
+                raise
+            if full_response:
+                # Out of time mid-stream: keep what already arrived
+                feedback = parser.feedback
+            else:
+                feedback = None
+                self.coach_breaker.record_failure()
+
+        if feedback is None:
+            # The coach failed or stalled before saying anything; keep the local feedback
+            pane.clear_provisional()
+            provisional.overall_note = FALLBACK_NOTE
+            pane.show_feedback(provisional)
+            self.render.request()
+            return provisional
+
+        self.latency.record("coach_complete", time.perf_counter() - started)
+
+        # Show whatever the validation step added
+        shown = parser.values
+        for field in LIST_FIELDS:
+            for item in getattr(feedback, field)[len(shown.get(field, [])):]:
+                pane.add_feedback_item(field, item)
+        if feedback.overall_note and "overall_note" not in shown:
+            pane.add_feedback_item("overall_note", feedback.overall_note)
+        pane.finish_feedback(feedback)
+        self.render.request()
 
         return feedback
 
-    async def _run_client(self, conversation: list[dict]) -> str:
+    async def _run_client(self, conversation: list[dict], started: float) -> Optional[str]:
         """Run the client agent and update UI."""
         self.layout.conversation_pane.start_streaming("client")
 
         full_response = ""
-        async for chunk in self.client_agent.respond(conversation):
-            full_response += chunk
-            self.layout.conversation_pane.append_streaming(chunk)
-            self.app.invalidate()
+        try:
+            async with asyncio.timeout(CLIENT_TIMEOUT):
+                async for chunk in self.client_agent.respond(conversation):
+                    if not full_response:
+                        self.latency.record("client_first_chunk", time.perf_counter() - started)
+                    full_response += chunk
+                    self.layout.conversation_pane.append_streaming(chunk)
+                    self.render.request()
+        except Exception as e:
+            # Cancellation is not an Exception, so only real failures end up here
+            self.layout.conversation_pane.discard_streaming()
+            if isinstance(e, TimeoutError):
+                reason = f"The client did not reply within {CLIENT_TIMEOUT:.0f}s."
+            else:
+                reason = f"The client failed to reply: {e}."
+            self.layout.feedback_pane.show_error(f"{reason} Send your message again to retry.")
+            return None
 
-        self.layout.conversation_pane.finish_streaming()
+        self.latency.record("client_complete", time.perf_counter() - started)
 
         # Add to conversation tree
-        self.session.conversation.add_message("client", full_response)
+        node = self.session.conversation.add_message("client", full_response)
+        self.layout.conversation_pane.finish_streaming(node.id)
 
         return full_response
 
@@ -272,12 +491,14 @@ class MITrainerApp:
   /debrief       - Full session analysis
   /quit          - Exit (prompts to save)
   /save          - Save current session
-  /load <name>   - Load a saved session
+  /load [filter] - List saved sessions (by scenario, from:/to: date, page:N)
+  /load <n>      - Load a saved session
   /scenario [n]  - List or select scenario
   /new <desc>    - Generate new scenario
   /rewind [n]    - Go back n messages
   /branches      - Show branches
-  /goto <id>     - Jump to node"""
+  /goto <id>     - Jump to node
+  /stats         - Show token usage and latency"""
         self.layout.feedback_pane.show_info(help_text)
 
     async def _cmd_hint(self, args: str) -> None:
@@ -286,15 +507,8 @@ class MITrainerApp:
             self.layout.feedback_pane.show_error("No conversation yet. Start talking first!")
             return
 
-        self.layout.feedback_pane.show_info("Thinking...")
-        self.layout.set_status("Getting hint...")
-        self.app.invalidate()
-
-        conversation = self.session.conversation.get_conversation_for_llm()
-        hint = await self.coach_agent.get_hint(conversation)
-
-        self.layout.feedback_pane.show_info(f"Hint: {hint}")
-        self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
+        transcript = self.session.conversation.get_transcript()
+        await self._stream_aside("Hint", "Getting hint...", self.coach_agent.stream_hint(transcript))
 
     async def _cmd_debrief(self, args: str) -> None:
         """Get a full session debrief."""
@@ -303,21 +517,44 @@ class MITrainerApp:
             return
 
         # Check if there's enough conversation to debrief
-        conversation = self.session.conversation.get_conversation_for_llm()
-        if len(conversation) < 4:
+        path = self.session.conversation.get_path_to_current()
+        if len(path) < 4:
             self.layout.feedback_pane.show_error("Have a longer conversation first (at least 2 exchanges).")
             return
 
         self.layout.feedback_pane.clear()
-        self.layout.feedback_pane.show_info("Analyzing session... (this may take a moment)")
-        self.layout.set_status("Generating debrief...")
-        self.app.invalidate()
+        await self._stream_aside(
+            "Session Debrief", "Generating debrief...", self.coach_agent.stream_debrief(path)
+        )
 
-        debrief = await self.coach_agent.get_debrief(conversation)
+    async def _stream_aside(self, header: str, status: str, chunks: AsyncIterator[str]) -> None:
+        """Stream a hint or debrief into the feedback pane.
 
-        self.layout.feedback_pane.clear()
-        self.layout.feedback_pane.show_info(debrief)
-        self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
+        Sending a new message cancels it, since it describes the conversation
+        as it was before.
+        """
+        self.layout.set_status(status)
+        self.render.request()
+        await self.turns.run_aside(self._render_aside(header, chunks))
+        if self.session:
+            self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
+
+    async def _render_aside(self, header: str, chunks: AsyncIterator[str]) -> None:
+        pane = self.layout.feedback_pane
+        pane.start_streaming(header)
+        try:
+            async with asyncio.timeout(ASIDE_TIMEOUT):
+                async for chunk in chunks:
+                    pane.append_streaming(chunk)
+                    self.render.request()
+        except TimeoutError:
+            pane.append_streaming("\n(Timed out)")
+        except asyncio.CancelledError:
+            pane.append_streaming("\n(Stopped)")
+            raise
+        finally:
+            pane.finish_streaming()
+            self.render.request()
 
     async def _cmd_quit(self, args: str) -> None:
         """Quit the application."""
@@ -333,44 +570,94 @@ class MITrainerApp:
 
     async def _save_session(self) -> None:
         """Save the current session to disk."""
+        await self._wait_loaded()
         if self.session:
-            path = save_session(self.session)
+            try:
+                if self.journal is not None:
+                    path = await storage.run_io(self.journal.checkpoint)
+                else:
+                    path = await storage.save_session(self.session)
+            except Exception as e:
+                self.layout.feedback_pane.show_error(f"Failed to save session: {e}")
+                return
             self.layout.feedback_pane.show_info(f"Session saved: {path.name}")
 
+    @staticmethod
+    def _parse_session_filter(args: str) -> tuple[dict, int]:
+        """Filters and page number from `/load` arguments.
+
+        `from:YYYY-MM-DD` and `to:YYYY-MM-DD` bound the start date (both
+        inclusive), `page:N` picks a page, and other words match the
+        scenario name.
+        """
+        filters: dict = {}
+        page = 1
+        words = []
+        for word in args.split():
+            key, _, value = word.partition(":")
+            if key == "from" and value:
+                filters["since"] = datetime.fromisoformat(value)
+            elif key == "to" and value:
+                filters["until"] = datetime.fromisoformat(value) + timedelta(days=1)
+            elif key == "page" and value:
+                page = max(1, int(value))
+            else:
+                words.append(word)
+        if words:
+            filters["scenario"] = " ".join(words)
+        return filters, page
+
     async def _cmd_load(self, args: str) -> None:
-        """Load a saved session."""
-        sessions = list_sessions()
+        """List saved sessions a page at a time, or load one by its number in the list."""
+        if args.strip().isdigit():
+            await self._load_session_number(int(args))
+            return
+
+        try:
+            filters, page = self._parse_session_filter(args)
+        except ValueError:
+            self.layout.feedback_pane.show_error("Dates are YYYY-MM-DD and pages are numbers.")
+            return
+
+        offset = (page - 1) * SESSION_PAGE_SIZE
+        sessions, total = await storage.find_sessions(**filters, limit=SESSION_PAGE_SIZE, offset=offset)
         if not sessions:
-            self.layout.feedback_pane.show_info("No saved sessions found.")
+            self.layout.feedback_pane.show_info(
+                "No saved sessions found." if not total else f"There are only {total} matching sessions."
+            )
             return
 
-        if not args:
-            self.layout.feedback_pane.show_info("Saved sessions:")
-            for i, (path, name, date) in enumerate(sessions, 1):
-                self.layout.feedback_pane.show_info(
-                    f"  {i}. {name} ({date.strftime('%Y-%m-%d %H:%M')})"
-                )
-            self.layout.feedback_pane.show_info("\nUse /load <number> to load.")
+        # Numbers refer to this listing's filters until the next listing
+        self._session_filter = filters
+        self.layout.feedback_pane.show_info(
+            f"Saved sessions ({offset + 1}-{offset + len(sessions)} of {total}):"
+        )
+        for i, info in enumerate(sessions, offset + 1):
+            self.layout.feedback_pane.show_info(
+                f"  {i}. {info.scenario_name} ({info.created_at.strftime('%Y-%m-%d %H:%M')}, "
+                f"{info.node_count} messages)"
+            )
+        more = ""
+        if offset + len(sessions) < total:
+            words = [word for word in args.split() if not word.startswith("page:")]
+            more = f" or /load {' '.join(words + [f'page:{page + 1}'])} for more"
+        self.layout.feedback_pane.show_info(f"\nUse /load <number> to load{more}.")
+
+    async def _load_session_number(self, number: int) -> None:
+        """Load the session at `number` in the last listing."""
+        sessions, _ = await storage.find_sessions(**self._session_filter, limit=1, offset=max(0, number - 1))
+        if number < 1 or not sessions:
+            self.layout.feedback_pane.show_error("Invalid session number.")
             return
 
-        try:
-            idx = int(args) - 1
-            if 0 <= idx < len(sessions):
-                path, _, _ = sessions[idx]
-                self.session = load_session(path)
-                self.client_agent = ClientAgent(self.session.scenario)
-                self.layout.conversation_pane.clear()
-                self.layout.conversation_pane.load_conversation(self.session.conversation)
-                self.layout.feedback_pane.show_info(f"Loaded: {self.session.scenario.name}")
-                self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
-            else:
-                self.layout.feedback_pane.show_error("Invalid session number.")
-        except ValueError:
-            self.layout.feedback_pane.show_error("Please specify a session number.")
+        self.layout.conversation_pane.clear()
+        await self._open_session(sessions[0].path)
+        self.layout.feedback_pane.show_info(f"Loaded: {self.session.scenario.name}")
+        self.layout.set_status(f"Scenario: {self.session.scenario.name} | /help for commands")
 
     async def _cmd_scenario(self, args: str) -> None:
         """List or select a scenario."""
-        scenarios = list_all_scenarios()
+        scenarios = await storage.list_all_scenarios()
 
         if not scenarios:
             self.layout.feedback_pane.show_info("No scenarios found. Use /new <description> to create one.")
@@ -390,16 +677,19 @@ class MITrainerApp:
             if 0 <= idx < len(scenarios):
                 scenario = scenarios[idx]
         except ValueError:
-            scenario = load_scenario_by_name(args)
+            scenario = await storage.load_scenario_by_name(args)
 
         if scenario:
+            # Stop the old session's turns before they can touch the new one
+            self._cancel_turns()
+            self._set_client_scenario(scenario)
             self.session = create_session(scenario)
-            self.client_agent = ClientAgent(scenario)
+            await self._start_journal()
             self.layout.conversation_pane.clear()
             self.layout.feedback_pane.clear()
             self.layout.feedback_pane.show_info(f"Starting scenario: {scenario.name}")
             self.layout.set_status(f"Scenario: {scenario.name} | /help for commands")
-            await self._get_client_opening()
+            self.turns.schedule(self._get_client_opening)
         else:
             self.layout.feedback_pane.show_error(f"Scenario not found: {args}")
 
@@ -411,11 +701,11 @@ class MITrainerApp:
 
         self.layout.feedback_pane.show_info("Generating scenario...")
         self.layout.set_status("Generating scenario...")
-        self.app.invalidate()
+        self.render.request()
 
         try:
             scenario = await self.scenario_builder.build_scenario(args)
-            save_user_scenario(scenario)
+            await storage.save_user_scenario(scenario)
             self.layout.feedback_pane.show_info(f"Created scenario: {scenario.name}")
             self.layout.feedback_pane.show_info("Use /scenario to select it.")
         except Exception as e:
@@ -434,12 +724,14 @@ class MITrainerApp:
             try:
                 steps = int(args)
             except ValueError:
+                steps = 0
+            if steps < 1:
                 self.layout.feedback_pane.show_error("Invalid number of steps.")
                 return
 
         node = self.session.conversation.rewind(steps)
         if node:
-            self.layout.conversation_pane.clear()
+            self.turns.cancel()
             self.layout.conversation_pane.load_conversation(self.session.conversation)
             self.layout.feedback_pane.show_info(f"Rewound {steps} step(s).")
 
@@ -484,7 +776,7 @@ class MITrainerApp:
             if 0 <= idx < len(branches):
                 node = self.session.conversation.goto(branches[idx].id)
                 if node:
-                    self.layout.conversation_pane.clear()
+                    self.turns.cancel()
                     self.layout.conversation_pane.load_conversation(self.session.conversation)
                     self.layout.feedback_pane.show_info(f"Jumped to branch {idx + 1}.")
                 return
@@ -494,8 +786,25 @@ class MITrainerApp:
         # Try as node ID
         node = self.session.conversation.goto(args)
         if node:
-            self.layout.conversation_pane.clear()
+            self.turns.cancel()
             self.layout.conversation_pane.load_conversation(self.session.conversation)
             self.layout.feedback_pane.show_info(f"Jumped to node {args}.")
         else:
             self.layout.feedback_pane.show_error(f"Node not found: {args}")
+
+    async def _cmd_stats(self, args: str) -> None:
+        """Show token usage, prompt cache and turn latency statistics."""
+        agents = [
+            ("Client", self.client_agent),
+            ("Coach", self.coach_agent),
+            ("Scenario builder", self.scenario_builder),
+        ]
+        self.layout.feedback_pane.show_info("Token usage:")
+        for label, agent in agents:
+            if agent and (agent.usage.requests or agent.usage.cached_responses):
+                self.layout.feedback_pane.show_info(f"  {label}: {agent.usage.summary()}")
+
+        if self.latency.samples:
+            self.layout.feedback_pane.show_info("Turn latency:")
+            for line in self.latency.summary():
+                self.layout.feedback_pane.show_info(f"  {line}")
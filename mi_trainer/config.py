@@ -8,6 +8,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    return float(os.environ.get(name, default))
+
+
 def get_api_key() -> str:
     """Get the Anthropic API key from environment."""
     key = os.environ.get("ANTHROPIC_API_KEY")
@@ -33,3 +43,103 @@ BUILTIN_SCENARIOS_DIR = Path(__file__).parent / "scenarios"
 
 # Model configuration
 DEFAULT_MODEL = "claude-sonnet-4-20250514"
+
+# Mark system prompts and conversation prefixes for Anthropic prompt caching
+PROMPT_CACHING = os.environ.get("MI_TRAINER_PROMPT_CACHING", "1") != "0"
+
+# Shared HTTP connection pool for the Anthropic client
+HTTP_MAX_CONNECTIONS = _env_int("MI_TRAINER_HTTP_MAX_CONNECTIONS", 20)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = _env_int("MI_TRAINER_HTTP_MAX_KEEPALIVE", 10)
+HTTP_KEEPALIVE_EXPIRY = _env_float("MI_TRAINER_HTTP_KEEPALIVE_EXPIRY", 120.0)
+HTTP_TIMEOUT = _env_float("MI_TRAINER_HTTP_TIMEOUT", 600.0)
+
+# Client-side rate limits for API calls (0 disables a limit) and retry policy
+RATE_LIMIT_REQUESTS_PER_MINUTE = _env_int("MI_TRAINER_RATE_LIMIT_RPM", 50)
+RATE_LIMIT_TOKENS_PER_MINUTE = _env_int("MI_TRAINER_RATE_LIMIT_TPM", 30000)
+API_MAX_RETRIES = _env_int("MI_TRAINER_API_MAX_RETRIES", 5)
+RETRY_BASE_DELAY = _env_float("MI_TRAINER_RETRY_BASE_DELAY", 1.0)
+RETRY_MAX_DELAY = _env_float("MI_TRAINER_RETRY_MAX_DELAY", 30.0)
+
+# Disk cache for deterministic calls (hints, debriefs, openings, scenario generation)
+RESPONSE_CACHE_ENABLED = os.environ.get("MI_TRAINER_RESPONSE_CACHE", "1") != "0"
+RESPONSE_CACHE_DIR = DATA_DIR / "cache" / "responses"
+RESPONSE_CACHE_MAX_BYTES = _env_int("MI_TRAINER_RESPONSE_CACHE_MAX_BYTES", 50 * 1024 * 1024)
+RESPONSE_CACHE_TTL = _env_float("MI_TRAINER_RESPONSE_CACHE_TTL", 7 * 24 * 3600)
+# Seconds a cached stream nobody is reading keeps generating, in case the same
+# request comes again (e.g. a repeated /hint, which supersedes the first)
+STREAM_ABANDON_DELAY = _env_float("MI_TRAINER_STREAM_ABANDON_DELAY", 1.0)
+
+# Record/replay of API traffic (see agents.cassette); --record/--replay override these
+CASSETTE_PATH = Path(os.environ["MI_TRAINER_CASSETTE"]) if os.environ.get("MI_TRAINER_CASSETTE") else None
+CASSETTE_MODE = os.environ.get("MI_TRAINER_CASSETTE_MODE", "replay")
+REPLAY_SPEED = _env_float("MI_TRAINER_REPLAY_SPEED", 1.0)
+
+# LLM backend per agent: "anthropic", "openai" (any OpenAI-compatible server,
+# e.g. llama.cpp or vLLM) or "fake" (deterministic synthetic tokens for benchmarks)
+AGENT_BACKENDS = {
+    "client": os.environ.get("MI_TRAINER_CLIENT_BACKEND", "anthropic"),
+    "coach": os.environ.get("MI_TRAINER_COACH_BACKEND", "anthropic"),
+    "scenario_builder": os.environ.get("MI_TRAINER_SCENARIO_BUILDER_BACKEND", "anthropic"),
+    "summarizer": os.environ.get("MI_TRAINER_SUMMARIZER_BACKEND", "anthropic"),
+}
+
+# OpenAI-compatible local inference server
+LOCAL_LLM_BASE_URL = os.environ.get("MI_TRAINER_LOCAL_BASE_URL", "http://localhost:8000/v1")
+LOCAL_LLM_MODEL = os.environ.get("MI_TRAINER_LOCAL_MODEL", "local-model")
+LOCAL_LLM_API_KEY = os.environ.get("MI_TRAINER_LOCAL_API_KEY", "")
+
+# Fake backend output rate and length
+FAKE_TOKENS_PER_SECOND = _env_float("MI_TRAINER_FAKE_TOKENS_PER_SECOND", 50.0)
+FAKE_RESPONSE_TOKENS = _env_int("MI_TRAINER_FAKE_RESPONSE_TOKENS", 80)
+
+# Client context window: recent messages kept verbatim, older ones folded into
+# a running summary once this many accumulate or the window exceeds the budget
+CONTEXT_KEEP_MESSAGES = _env_int("MI_TRAINER_CONTEXT_KEEP_MESSAGES", 12)
+CONTEXT_SUMMARY_BATCH = _env_int("MI_TRAINER_CONTEXT_SUMMARY_BATCH", 8)
+CONTEXT_MAX_TOKENS = _env_int("MI_TRAINER_CONTEXT_MAX_TOKENS", 6000)
+
+# Follow-up requests allowed to fix missing or invalid fields in structured output
+STRUCTURED_OUTPUT_REPAIRS = _env_int("MI_TRAINER_STRUCTURED_OUTPUT_REPAIRS", 1)
+
+# Debriefs analyze long sessions in fixed chunks of this many messages (in
+# parallel, cached per chunk) before a short reduce step writes the narrative
+DEBRIEF_CHUNK_MESSAGES = _env_int("MI_TRAINER_DEBRIEF_CHUNK_MESSAGES", 12)
+DEBRIEF_MAX_TOKENS = _env_int("MI_TRAINER_DEBRIEF_MAX_TOKENS", 1024)
+
+# Coach circuit breaker: after this many consecutive coach calls that fail or
+# take longer than COACH_SLOW_SECONDS to start, use only the local classifier
+# for a cooldown period before trying the API again
+COACH_SLOW_SECONDS = _env_float("MI_TRAINER_COACH_SLOW_SECONDS", 8.0)
+COACH_BREAKER_TRIPS = _env_int("MI_TRAINER_COACH_BREAKER_TRIPS", 2)
+COACH_BREAKER_COOLDOWN = _env_float("MI_TRAINER_COACH_BREAKER_COOLDOWN", 120.0)
+
+# Per-call time limits (seconds) for streamed replies; work past its limit is
+# cancelled rather than left spending tokens on output nobody will see
+CLIENT_TIMEOUT = _env_float("MI_TRAINER_CLIENT_TIMEOUT", 90.0)
+COACH_TIMEOUT = _env_float("MI_TRAINER_COACH_TIMEOUT", 60.0)
+ASIDE_TIMEOUT = _env_float("MI_TRAINER_ASIDE_TIMEOUT", 180.0)
+
+# Repaint rate while streaming; slow renders back off towards the minimum
+RENDER_MAX_FPS = _env_float("MI_TRAINER_RENDER_MAX_FPS", 30.0)
+RENDER_MIN_FPS = _env_float("MI_TRAINER_RENDER_MIN_FPS", 5.0)
+
+# The feedback pane keeps this many entries (feedback blocks, hints, notices);
+# scrolling past the oldest pages in coach feedback from the session,
+# FEEDBACK_PAGE_SIZE turns at a time
+FEEDBACK_SCROLLBACK = _env_int("MI_TRAINER_FEEDBACK_SCROLLBACK", 200)
+FEEDBACK_PAGE_SIZE = _env_int("MI_TRAINER_FEEDBACK_PAGE_SIZE", 10)
+
+# Session journal: changes are appended as they happen and synced to disk
+# this many seconds after the first unsynced one; after this many records the
+# journal is folded into the session file
+JOURNAL_SYNC_DELAY = _env_float("MI_TRAINER_JOURNAL_SYNC_DELAY", 0.5)
+JOURNAL_COMPACT_RECORDS = _env_int("MI_TRAINER_JOURNAL_COMPACT_RECORDS", 500)
+
+# Threads for file I/O and parsing, so loading and saving never block the UI
+STORAGE_WORKERS = _env_int("MI_TRAINER_STORAGE_WORKERS", 4)
+
+# Saved sessions are listed from an SQLite index of their metadata, kept in
+# step with the session files by modification time; /load shows this many
+# sessions per page
+SESSION_INDEX_PATH = SESSIONS_DIR / "index.sqlite3"
+SESSION_PAGE_SIZE = _env_int("MI_TRAINER_SESSION_PAGE_SIZE", 10)
@@ -4,6 +4,7 @@ import argparse
 import asyncio
 import sys
 
+from mi_trainer.agents.cassette import configure_cassette
 from mi_trainer.app import MITrainerApp
 from mi_trainer.storage.scenarios import load_scenario_by_name, list_all_scenarios
 
@@ -21,6 +22,22 @@ def parse_args() -> argparse.Namespace:
         "--load", "-l",
         help="Path to session file to load",
     )
+    parser.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        help="Record all API responses to a cassette file",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="Replay API responses from a cassette file instead of calling the API",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Timing multiplier for --replay (1 = recorded timing, 0 = no delays)",
+    )
     parser.add_argument(
         "--list-scenarios",
         action="store_true",
@@ -61,6 +78,14 @@ def main() -> None:
             print("Use --list-scenarios to see available scenarios.")
             sys.exit(1)
 
+    if args.record and args.replay:
+        print("Use either --record or --replay, not both.")
+        sys.exit(1)
+    if args.record:
+        configure_cassette(args.record, "record")
+    elif args.replay:
+        configure_cassette(args.replay, "replay", args.replay_speed)
+
     # Create and run app
     app = MITrainerApp()
 
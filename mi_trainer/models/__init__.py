@@ -1,7 +1,8 @@
 """Data models for MI Trainer."""
 
 from mi_trainer.models.scenario import Scenario
-from mi_trainer.models.conversation import ConversationNode, ConversationTree
-from mi_trainer.models.feedback import CoachFeedback
+from mi_trainer.models.conversation import ConversationNode, ConversationTree, NodeRecord
+from mi_trainer.models.feedback import CoachFeedback, DebriefStats
+from mi_trainer.models.usage import LatencyStats, TokenUsage
 
-__all__ = ["Scenario", "ConversationNode", "ConversationTree", "CoachFeedback"]
+__all__ = ["Scenario", "ConversationNode", "ConversationTree", "NodeRecord", "CoachFeedback", "DebriefStats", "LatencyStats", "TokenUsage"]
@@ -1,41 +1,77 @@
 """Conversation tree data model."""
 
-from datetime import datetime
-from typing import Literal, Optional
-import uuid
+from typing import Callable, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from mi_trainer.models.feedback import CoachFeedback
-
-
-class ConversationNode(BaseModel):
-    """A single message in the conversation tree."""
-
-    id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
-    role: Literal["user", "client"] = Field(description="Who sent this message")
-    content: str = Field(description="The message content")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    parent_id: Optional[str] = Field(default=None, description="ID of parent node")
-    children: list[str] = Field(
-        default_factory=list, description="IDs of child nodes"
-    )
-    coach_feedback: Optional[CoachFeedback] = Field(
-        default=None, description="Coach feedback for user messages"
-    )
+from mi_trainer.models.node_store import NO_NODE, Change, ConversationNode, NodeRecord, NodeStore
 
 
 class ConversationTree(BaseModel):
-    """A tree of conversation nodes supporting branching."""
+    """A tree of conversation nodes supporting branching.
+
+    Nodes live in a compact `NodeStore`, which also indexes their depth and
+    ancestors, so rewinding any number of steps and finding the common
+    ancestor of two branches take O(log n). The root-to-current path is
+    cached and updated from the common ancestor when the current node moves,
+    so following a conversation costs O(1) per turn.
+    """
 
-    nodes: dict[str, ConversationNode] = Field(
-        default_factory=dict, description="All nodes by ID"
+    nodes: NodeStore = Field(
+        default_factory=NodeStore, description="All nodes by ID"
     )
     root_id: Optional[str] = Field(default=None, description="ID of root node")
     current_id: Optional[str] = Field(
         default=None, description="ID of current position in tree"
     )
 
+    # The path to the current node, and its transcript as one segment per node
+    _path: list[ConversationNode] = PrivateAttr(default_factory=list)
+    _transcript: list[str] = PrivateAttr(default_factory=list)
+
+    def watch(self, callback: Optional[Callable[[Change], None]]) -> None:
+        """Call `callback` with a record of every change (None to stop).
+
+        Records cover added messages, feedback and summaries attached to
+        nodes, and moves of the current node; `apply_change` replays them.
+        """
+        self.nodes.on_change = callback
+
+    def _changed(self, change: Change) -> None:
+        if self.nodes.on_change is not None:
+            self.nodes.on_change(change)
+
+    def apply_change(self, change: Change) -> None:
+        """Replay a change record; records already reflected in the tree are no-ops."""
+        op = change["op"]
+        if op == "add":
+            if change["id"] in self.nodes:
+                return
+            parent = change["parent"]
+            self.nodes.add(
+                change["role"],
+                change["content"],
+                NO_NODE if parent is None else self.nodes.number(parent),
+                node_id=change["id"],
+                timestamp=change["ts"],
+            )
+            if parent is None and self.root_id is None:
+                self.root_id = change["id"]
+            self.current_id = change["id"]
+        elif op == "feedback":
+            feedback = change["feedback"]
+            self.nodes.set_feedback(
+                self.nodes.number(change["id"]),
+                None if feedback is None else CoachFeedback.model_validate(feedback),
+            )
+        elif op == "summary":
+            self.nodes.summaries.pop(self.nodes.number(change["id"]), None)
+            if change["summary"] is not None:
+                self.nodes.summaries[self.nodes.number(change["id"])] = change["summary"]
+        elif op == "goto":
+            self.current_id = change["id"]
+
     def add_message(
         self,
         role: Literal["user", "client"],
@@ -43,20 +79,26 @@ class ConversationTree(BaseModel):
         coach_feedback: Optional[CoachFeedback] = None,
     ) -> ConversationNode:
         """Add a new message as a child of the current node."""
-        node = ConversationNode(
-            role=role,
-            content=content,
-            parent_id=self.current_id,
-            coach_feedback=coach_feedback,
+        parent = NO_NODE if self.current_id is None else self.nodes.number(self.current_id)
+        node = self.nodes.node(
+            self.nodes.add(role, content, parent, coach_feedback=coach_feedback)
         )
 
-        self.nodes[node.id] = node
-
         if self.current_id is None:
             self.root_id = node.id
-        else:
-            self.nodes[self.current_id].children.append(node.id)
 
+        # Records are only built while someone is watching
+        if self.nodes.on_change is not None:
+            self._changed({
+                "op": "add",
+                "id": node.id,
+                "role": role,
+                "content": content,
+                "parent": self.current_id,
+                "ts": self.nodes.timestamps[node.number],
+            })
+            if coach_feedback is not None:
+                self._changed({"op": "feedback", "id": node.id, "feedback": coach_feedback.model_dump(mode="json")})
         self.current_id = node.id
         return node
 
@@ -66,39 +108,66 @@ class ConversationTree(BaseModel):
             return None
         return self.nodes.get(self.current_id)
 
-    def get_path_to_current(self) -> list[ConversationNode]:
-        """Get the path from root to current node."""
-        if self.current_id is None:
-            return []
+    def depth(self, node_id: str) -> int:
+        """Number of messages above a node (the root has depth 0)."""
+        return self.nodes.depths[self.nodes.number(node_id)]
+
+    def ancestor(self, node_id: str, steps: int) -> str:
+        """The node `steps` levels above `node_id`, or the root if the tree is shallower."""
+        return self.nodes.ids[self.nodes.ancestor(self.nodes.number(node_id), steps)]
+
+    def lowest_common_ancestor(self, a: str, b: str) -> str:
+        """The deepest node that is an ancestor of (or equal to) both nodes."""
+        return self.nodes.ids[self.nodes.common_ancestor(self.nodes.number(a), self.nodes.number(b))]
+
+    def _sync_path(self) -> None:
+        """Bring the cached path up to date with the current node.
+
+        The path is cut back to the common ancestor of its old end and the
+        current node, then extended, so the cost is the length of the branch
+        that changed.
+        """
+        target = NO_NODE if self.current_id is None else self.nodes.number(self.current_id)
+        tip = self._path[-1].number if self._path else NO_NODE
+        if tip == target:
+            return
+        if target == NO_NODE or tip == NO_NODE:
+            keep = 0
+        else:
+            keep = self.nodes.depths[self.nodes.common_ancestor(tip, target)] + 1
 
-        path = []
-        node_id = self.current_id
-        while node_id is not None:
-            node = self.nodes[node_id]
-            path.append(node)
-            node_id = node.parent_id
+        new_nodes = []
+        number = target
+        length = self.nodes.depths[target] + 1 if target != NO_NODE else 0
+        for _ in range(length - keep):
+            new_nodes.append(self.nodes.node(number))
+            number = self.nodes.parents[number]
 
-        return list(reversed(path))
+        del self._path[keep:]
+        del self._transcript[keep:]
+        for node in reversed(new_nodes):
+            self._path.append(node)
+            self._transcript.append(node.transcript_segment())
+
+    def get_path_to_current(self) -> list[ConversationNode]:
+        """Get the path from root to current node."""
+        self._sync_path()
+        return list(self._path)
 
     def rewind(self, steps: int = 1) -> Optional[ConversationNode]:
         """Move back up the tree by the given number of steps."""
         if self.current_id is None:
             return None
 
-        node_id = self.current_id
-        for _ in range(steps):
-            node = self.nodes.get(node_id)
-            if node is None or node.parent_id is None:
-                break
-            node_id = node.parent_id
-
-        self.current_id = node_id
-        return self.nodes.get(node_id)
+        self.current_id = self.ancestor(self.current_id, steps)
+        self._changed({"op": "goto", "id": self.current_id})
+        return self.nodes.get(self.current_id)
 
     def goto(self, node_id: str) -> Optional[ConversationNode]:
         """Jump to a specific node by ID."""
         if node_id in self.nodes:
             self.current_id = node_id
+            self._changed({"op": "goto", "id": node_id})
             return self.nodes[node_id]
         return None
 
@@ -106,19 +175,28 @@ class ConversationTree(BaseModel):
         """Get all child branches from the current node."""
         if self.current_id is None:
             return []
-        current = self.nodes.get(self.current_id)
-        if current is None:
+        if self.current_id not in self.nodes:
             return []
-        return [self.nodes[child_id] for child_id in current.children]
+        return [self.nodes.node(child) for child in self.nodes.children(self.nodes.number(self.current_id))]
 
     def get_conversation_for_llm(self) -> list[dict[str, str]]:
         """Get the conversation path formatted for LLM context."""
-        path = self.get_path_to_current()
+        self._sync_path()
         return [
             {"role": "assistant" if node.role == "client" else "user", "content": node.content}
-            for node in path
+            for node in self._path
         ]
 
+    def get_transcript(self) -> list[str]:
+        """Get the root-to-current path as formatted transcript segments.
+
+        Segments are kept alongside the cached path, so after adding a
+        message only the new node is formatted, and after switching branches
+        only the part below the common ancestor is rebuilt.
+        """
+        self._sync_path()
+        return list(self._transcript)
+
     def is_empty(self) -> bool:
         """Check if the tree has no messages."""
         return len(self.nodes) == 0
@@ -34,3 +34,49 @@ class CoachFeedback(BaseModel):
     def has_suggestions(self) -> bool:
         """Check if there are suggestions for improvement."""
         return len(self.suggestions) > 0
+
+
+class DebriefStats(BaseModel):
+    """Session-wide tallies aggregated from per-turn coach feedback."""
+
+    practitioner_turns: int = 0
+    turns_with_feedback: int = 0
+    technique_counts: dict[str, int] = Field(default_factory=dict)
+    mi_consistent: int = 0
+    mi_inconsistent: int = 0
+
+    def add(self, feedback: CoachFeedback) -> None:
+        """Fold one turn's feedback into the tallies."""
+        self.turns_with_feedback += 1
+        for technique in feedback.techniques_used:
+            label = technique.strip().lower().replace(" ", "_").replace("-", "_")
+            self.technique_counts[label] = self.technique_counts.get(label, 0) + 1
+        self.mi_consistent += len(feedback.mi_consistent)
+        self.mi_inconsistent += len(feedback.mi_inconsistent)
+
+    def count(self, keyword: str) -> int:
+        """Total uses of techniques whose label contains `keyword`."""
+        return sum(n for label, n in self.technique_counts.items() if keyword in label)
+
+    def to_markdown(self) -> str:
+        """Render the tallies as the debrief's techniques section."""
+        lines = ["## Techniques Used"]
+        for label, n in sorted(self.technique_counts.items(), key=lambda item: (-item[1], item[0])):
+            lines.append(f"- {label.replace('_', ' ').capitalize()}: {n}")
+        if not self.technique_counts:
+            lines.append("- None identified")
+
+        questions = self.count("question")
+        reflections = self.count("reflection")
+        if questions:
+            lines.append(f"\nReflection-to-question ratio: {reflections / questions:.1f}")
+            lines.append(f"Open questions: {self.count('open_question') / questions:.0%} of questions")
+        lines.append(
+            f"MI-consistent observations: {self.mi_consistent} | "
+            f"MI-inconsistent: {self.mi_inconsistent}"
+        )
+        if self.turns_with_feedback < self.practitioner_turns:
+            lines.append(
+                f"(Based on {self.turns_with_feedback} of {self.practitioner_turns} turns with feedback.)"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,389 @@
+"""Compact storage for the nodes of a conversation tree."""
+
+import random
+import sys
+import time
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Iterator, Literal, Optional
+
+from pydantic import BaseModel, Field, GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from mi_trainer.models.feedback import CoachFeedback
+
+ROLES: tuple[str, ...] = ("user", "client")
+
+# Parent, child and ancestor slots that point at no node
+NO_NODE = -1
+
+# A change to a tree, as a JSON-ready record (see ConversationTree.apply_change)
+Change = dict[str, Any]
+
+
+def new_node_id() -> str:
+    """A short random node ID, as used in saved sessions.
+
+    IDs only need to be unique within a tree (`NodeStore.add` retries on a
+    clash), so they come from the fast non-cryptographic generator.
+    """
+    return f"{random.getrandbits(32):08x}"
+
+
+class NodeRecord(BaseModel):
+    """A single message in the conversation tree, as saved to disk."""
+
+    id: str = Field(default_factory=new_node_id)
+    role: Literal["user", "client"] = Field(description="Who sent this message")
+    content: str = Field(description="The message content")
+    timestamp: datetime = Field(default_factory=datetime.now)
+    parent_id: Optional[str] = Field(default=None, description="ID of parent node")
+    children: list[str] = Field(
+        default_factory=list, description="IDs of child nodes"
+    )
+    coach_feedback: Optional[CoachFeedback] = Field(
+        default=None, description="Coach feedback for user messages"
+    )
+    summary: Optional[str] = Field(
+        default=None,
+        description="Running summary of the conversation from the root through this node",
+    )
+
+
+class ConversationNode:
+    """A single message in the conversation tree.
+
+    A light view of one node of a `NodeStore`: attributes are read from the
+    store's arrays, and feedback and summaries are written back to it.
+    """
+
+    __slots__ = ("store", "number")
+
+    def __init__(self, store: "NodeStore", number: int):
+        self.store = store
+        self.number = number
+
+    @property
+    def id(self) -> str:
+        return self.store.ids[self.number]
+
+    @property
+    def role(self) -> Literal["user", "client"]:
+        return ROLES[self.store.roles[self.number]]
+
+    @property
+    def content(self) -> str:
+        return self.store.contents[self.number]
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.store.timestamps[self.number])
+
+    @property
+    def parent_id(self) -> Optional[str]:
+        parent = self.store.parents[self.number]
+        return None if parent == NO_NODE else self.store.ids[parent]
+
+    @property
+    def children(self) -> list[str]:
+        return [self.store.ids[child] for child in self.store.children(self.number)]
+
+    @property
+    def coach_feedback(self) -> Optional[CoachFeedback]:
+        return self.store.get_feedback(self.number)
+
+    @coach_feedback.setter
+    def coach_feedback(self, feedback: Optional[CoachFeedback]) -> None:
+        self.store.set_feedback(self.number, feedback)
+        if self.store.on_change is not None:
+            self.store.on_change({
+                "op": "feedback",
+                "id": self.id,
+                "feedback": None if feedback is None else feedback.model_dump(mode="json"),
+            })
+
+    @property
+    def summary(self) -> Optional[str]:
+        return self.store.summaries.get(self.number)
+
+    @summary.setter
+    def summary(self, summary: Optional[str]) -> None:
+        if summary is None:
+            self.store.summaries.pop(self.number, None)
+        else:
+            self.store.summaries[self.number] = summary
+        if self.store.on_change is not None:
+            self.store.on_change({"op": "summary", "id": self.id, "summary": summary})
+
+    def transcript_segment(self) -> str:
+        """This message formatted as a transcript line."""
+        role_label = "Practitioner" if self.role == "user" else "Client"
+        return f"{role_label}: {self.content}\n\n"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConversationNode):
+            return NotImplemented
+        return self.store is other.store and self.number == other.number
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.number))
+
+    def __repr__(self) -> str:
+        return f"ConversationNode(id={self.id!r}, role={self.role!r}, content={self.content[:40]!r})"
+
+
+class NodeStore(Mapping[str, ConversationNode]):
+    """All nodes of a tree in parallel arrays, numbered in insertion order.
+
+    Structure lives in typed arrays (parent, first/last child, next sibling,
+    role, timestamp) indexed by node number; message text is interned, and
+    feedback and summaries, which few nodes have, are kept in dicts. Each
+    node's depth and a single jump pointer to an ancestor are filled in as
+    it is added, in O(1). The jumps follow a skew-binary pattern (Myers'
+    jump pointers), so ancestor and common-ancestor queries take O(log n)
+    steps along jumps and parents.
+
+    As a mapping from node IDs to `ConversationNode` views it stands in for
+    a dict of nodes; pydantic only sees it when a tree is saved or loaded,
+    as a dict of `NodeRecord`s.
+    """
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self._numbers: dict[str, int] = {}
+        self.parents = array("i")
+        self.first_child = array("i")
+        self.last_child = array("i")
+        self.next_sibling = array("i")
+        self.roles = bytearray()
+        self.timestamps = array("d")
+        self.contents: list[str] = []
+        self.feedback: dict[int, CoachFeedback] = {}
+        # Feedback loaded by `construct`, built into `feedback` when first read
+        self._saved_feedback: dict[int, dict[str, Any]] = {}
+        self.summaries: dict[int, str] = {}
+        self.depths = array("i")
+        # An ancestor of each node, a skew-binary distance up (the root jumps to itself)
+        self.jumps = array("i")
+        # Called with each change made through a node view
+        self.on_change: Optional[Callable[[Change], None]] = None
+
+    def add(
+        self,
+        role: Literal["user", "client"],
+        content: str,
+        parent: int = NO_NODE,
+        *,
+        node_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        coach_feedback: Optional[CoachFeedback] = None,
+        summary: Optional[str] = None,
+    ) -> int:
+        """Add a node as the last child of `parent` and return its number."""
+        number = len(self.ids)
+        if node_id is None:
+            node_id = new_node_id()
+            while node_id in self._numbers:
+                node_id = new_node_id()
+        self.ids.append(node_id)
+        self._numbers[node_id] = number
+
+        self.parents.append(parent)
+        self.first_child.append(NO_NODE)
+        self.last_child.append(NO_NODE)
+        self.next_sibling.append(NO_NODE)
+        if parent != NO_NODE:
+            if self.last_child[parent] == NO_NODE:
+                self.first_child[parent] = number
+            else:
+                self.next_sibling[self.last_child[parent]] = number
+            self.last_child[parent] = number
+
+        self.roles.append(ROLES.index(role))
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+        self.contents.append(sys.intern(content))
+        if coach_feedback is not None:
+            self.feedback[number] = coach_feedback
+        if summary is not None:
+            self.summaries[number] = summary
+
+        self._index(number, parent)
+        return number
+
+    def _index(self, number: int, parent: int) -> None:
+        if parent == NO_NODE:
+            self.depths.append(0)
+            self.jumps.append(number)
+            return
+        depths, jumps = self.depths, self.jumps
+        depths.append(depths[parent] + 1)
+        # Two jumps of equal length above the parent merge into one twice as long
+        jump = jumps[parent]
+        if depths[parent] - depths[jump] == depths[jump] - depths[jumps[jump]]:
+            jumps.append(jumps[jump])
+        else:
+            jumps.append(parent)
+
+    # Lookup
+
+    def number(self, node_id: str) -> int:
+        """The number of the node with this ID (KeyError if there is none)."""
+        return self._numbers[node_id]
+
+    def node(self, number: int) -> ConversationNode:
+        return ConversationNode(self, number)
+
+    def children(self, number: int) -> list[int]:
+        result = []
+        child = self.first_child[number]
+        while child != NO_NODE:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def __getitem__(self, node_id: str) -> ConversationNode:
+        return ConversationNode(self, self._numbers[node_id])
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._numbers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def get_feedback(self, number: int) -> Optional[CoachFeedback]:
+        """A node's coach feedback, if it has any."""
+        saved = self._saved_feedback.pop(number, None)
+        if saved is not None:
+            self.feedback[number] = CoachFeedback.model_construct(**saved)
+        return self.feedback.get(number)
+
+    def set_feedback(self, number: int, feedback: Optional[CoachFeedback]) -> None:
+        """Replace a node's coach feedback (None to remove it)."""
+        self._saved_feedback.pop(number, None)
+        if feedback is None:
+            self.feedback.pop(number, None)
+        else:
+            self.feedback[number] = feedback
+
+    # Ancestry
+
+    def ancestor(self, number: int, steps: int) -> int:
+        """The node `steps` levels above `number`, or the root if the tree is shallower.
+
+        Zero or negative steps give the node itself.
+        """
+        steps = max(0, min(steps, self.depths[number]))
+        target = self.depths[number] - steps
+        while self.depths[number] > target:
+            jump = self.jumps[number]
+            number = jump if self.depths[jump] >= target else self.parents[number]
+        return number
+
+    def common_ancestor(self, a: int, b: int) -> int:
+        """The deepest node that is an ancestor of (or equal to) both nodes."""
+        if self.depths[a] < self.depths[b]:
+            a, b = b, a
+        a = self.ancestor(a, self.depths[a] - self.depths[b])
+        # Nodes at equal depths have jumps of equal length
+        while a != b:
+            if self.jumps[a] != self.jumps[b]:
+                a, b = self.jumps[a], self.jumps[b]
+            else:
+                a, b = self.parents[a], self.parents[b]
+        return a
+
+    # Serialization
+
+    @classmethod
+    def from_records(cls, records: Mapping[str, NodeRecord]) -> "NodeStore":
+        """Build a store from saved nodes, in their saved order."""
+        return cls._build(records, lambda record: (
+            record.role,
+            record.content,
+            record.parent_id,
+            record.timestamp.timestamp(),
+            record.coach_feedback,
+            record.summary,
+        ))
+
+    @classmethod
+    def construct(cls, records: Mapping[str, dict[str, Any]]) -> "NodeStore":
+        """Build a store from saved nodes as plain JSON data, without validating it.
+
+        Only for data known to be valid, such as a file this tool wrote
+        and that has not changed since (see `storage.trusted`). Feedback is
+        built when it is first read, as most of it never is.
+        """
+        store = cls._build(records, lambda data: (
+            data["role"],
+            data["content"],
+            data["parent_id"],
+            datetime.fromisoformat(data["timestamp"]).timestamp(),
+            None,
+            data["summary"],
+        ))
+        store._saved_feedback = {
+            store._numbers[node_id]: data["coach_feedback"]
+            for node_id, data in records.items()
+            if data["coach_feedback"] is not None
+        }
+        return store
+
+    @classmethod
+    def _build(cls, records: Mapping[str, Any], fields: Callable[[Any], tuple]) -> "NodeStore":
+        """Add records in their order, each after its parent.
+
+        `fields` gives a record's role, content, parent ID, timestamp,
+        feedback and summary.
+        """
+        store = cls()
+        for node_id in records:
+            # Parents first, in case a node is listed before its parent
+            pending = []
+            while node_id is not None and node_id in records and node_id not in store._numbers:
+                values = fields(records[node_id])
+                pending.append((node_id, values))
+                node_id = values[2]
+            for node_id, (role, content, parent_id, timestamp, coach_feedback, summary) in reversed(pending):
+                store.add(
+                    role,
+                    content,
+                    store._numbers.get(parent_id, NO_NODE),
+                    node_id=node_id,
+                    timestamp=timestamp,
+                    coach_feedback=coach_feedback,
+                    summary=summary,
+                )
+        return store
+
+    def to_records(self) -> dict[str, NodeRecord]:
+        """The nodes as records to save, in insertion order."""
+        return {
+            node_id: NodeRecord.model_construct(
+                id=node_id,
+                role=ROLES[self.roles[number]],
+                content=self.contents[number],
+                timestamp=datetime.fromtimestamp(self.timestamps[number]),
+                parent_id=None if self.parents[number] == NO_NODE else self.ids[self.parents[number]],
+                children=[self.ids[child] for child in self.children(number)],
+                coach_feedback=self.get_feedback(number),
+                summary=self.summaries.get(number),
+            )
+            for number, node_id in enumerate(self.ids)
+        }
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        records = handler.generate_schema(dict[str, NodeRecord])
+        from_records = core_schema.no_info_after_validator_function(cls.from_records, records)
+        return core_schema.json_or_python_schema(
+            json_schema=from_records,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(cls), from_records]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls.to_records, return_schema=records
+            ),
+        )
@@ -0,0 +1,83 @@
+"""Token usage accounting for model calls."""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class TokenUsage(BaseModel):
+    """Token counts accumulated across model calls, including prompt cache activity."""
+
+    requests: int = Field(default=0, description="Number of completed model calls")
+    input_tokens: int = Field(
+        default=0, description="Input tokens that were neither read from nor written to the cache"
+    )
+    cache_creation_input_tokens: int = Field(
+        default=0, description="Input tokens written to the prompt cache (cache misses)"
+    )
+    cache_read_input_tokens: int = Field(
+        default=0, description="Input tokens served from the prompt cache (cache hits)"
+    )
+    output_tokens: int = Field(default=0, description="Generated output tokens")
+    cached_responses: int = Field(
+        default=0, description="Calls answered from the local response cache without an API call"
+    )
+
+    def record(self, usage: Any) -> None:
+        """Add the usage block of a single API response."""
+        if usage is None:
+            return
+        self.requests += 1
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.cache_creation_input_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+        self.cache_read_input_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+
+    @property
+    def total_input_tokens(self) -> int:
+        """All input tokens, cached or not."""
+        return self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of input tokens served from the prompt cache."""
+        total = self.total_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+    def summary(self) -> str:
+        """One-line human-readable summary."""
+        return (
+            f"{self.requests} calls | in {self.total_input_tokens} "
+            f"(cache hit {self.cache_read_input_tokens}, "
+            f"miss {self.cache_creation_input_tokens}, "
+            f"uncached {self.input_tokens}) | out {self.output_tokens} | "
+            f"hit rate {self.cache_hit_rate:.0%} | "
+            f"{self.cached_responses} served locally"
+        )
+
+
+class LatencyStats(BaseModel):
+    """Latency samples for named pipeline stages, in seconds."""
+
+    samples: dict[str, list[float]] = Field(default_factory=dict)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one sample for a stage."""
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def percentile(self, stage: str, q: float) -> float:
+        """The q-th percentile (0-100) of a stage's samples, nearest-rank."""
+        values = sorted(self.samples.get(stage, []))
+        if not values:
+            return 0.0
+        rank = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+        return values[rank]
+
+    def summary(self) -> list[str]:
+        """One line per stage with sample count, median and p95."""
+        return [
+            f"{stage}: n={len(values)} "
+            f"p50 {self.percentile(stage, 50) * 1000:.0f}ms "
+            f"p95 {self.percentile(stage, 95) * 1000:.0f}ms"
+            for stage, values in self.samples.items()
+        ]
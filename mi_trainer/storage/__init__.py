@@ -1 +1,6 @@
 """Storage layer for MI Trainer."""
+
+from mi_trainer.storage import aio
+from mi_trainer.storage.sessions import Session, SessionJournal
+
+__all__ = ["aio", "Session", "SessionJournal"]
@@ -0,0 +1,104 @@
+"""Async storage API: file I/O, parsing and validation off the event loop."""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+from mi_trainer.config import STORAGE_WORKERS
+from mi_trainer.models.scenario import Scenario
+from mi_trainer.storage import index, scenarios, sessions
+from mi_trainer.storage.cancellation import cancel_event
+from mi_trainer.storage.index import SessionInfo
+from mi_trainer.storage.sessions import Session
+from mi_trainer.storage.trusted import dump_json
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide pool that runs blocking storage work."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=STORAGE_WORKERS, thread_name_prefix="storage")
+    return _executor
+
+
+async def run_io(func: Callable[..., T], *args) -> T:
+    """Run a blocking storage function in the pool.
+
+    At most STORAGE_WORKERS calls run at once; the rest wait their turn.
+    Cancelling the caller abandons the result and stops the function at its
+    next `check_cancelled`, e.g. between files of a directory listing.
+    """
+    event = threading.Event()
+    context = contextvars.copy_context()
+    context.run(cancel_event.set, event)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_executor(), context.run, func, *args)
+    except asyncio.CancelledError:
+        event.set()
+        raise
+
+
+# Sessions
+
+async def load_session(filepath: Path) -> Session:
+    """Load a session, replaying its journal, without blocking the event loop."""
+    return await run_io(sessions.load_session, filepath)
+
+
+async def load_session_path(filepath: Path) -> Session:
+    """Load just the path to a session's current node (see `sessions.load_session_path`)."""
+    return await run_io(sessions.load_session_path, filepath)
+
+
+async def save_session(session: Session, filename: Optional[str] = None) -> Path:
+    """Save a session; it is serialized here and written in the pool."""
+    filepath = sessions.session_path(session, filename)
+    session.updated_at = datetime.now()
+    text = dump_json(session)
+    await run_io(filepath.write_text, text)
+    return filepath
+
+
+async def list_sessions() -> list[tuple[Path, str, datetime]]:
+    """List saved sessions, newest first."""
+    return await run_io(sessions.list_sessions)
+
+
+async def find_sessions(
+    scenario: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = index.SESSION_PAGE_SIZE,
+    offset: int = 0,
+) -> tuple[list[SessionInfo], int]:
+    """One page of saved sessions from the index, newest first, and the total matching."""
+    return await run_io(index.find_sessions, scenario, since, until, limit, offset)
+
+
+# Scenarios
+
+async def list_all_scenarios() -> list[Scenario]:
+    """List all available scenarios (built-in and user)."""
+    return await run_io(scenarios.list_all_scenarios)
+
+
+async def load_scenario_by_name(name: str) -> Optional[Scenario]:
+    """Load a scenario by name (case-insensitive partial match)."""
+    return await run_io(scenarios.load_scenario_by_name, name)
+
+
+async def save_user_scenario(scenario: Scenario) -> Path:
+    """Save a scenario to the user scenarios directory."""
+    filepath = scenarios.user_scenario_path(scenario)
+    text = dump_json(scenario)
+    await run_io(filepath.write_text, text)
+    return filepath
@@ -0,0 +1,19 @@
+"""Cooperative cancellation of blocking storage work."""
+
+import asyncio
+import contextvars
+import threading
+from typing import Optional
+
+# Set in worker threads while an awaited storage call is running (see
+# storage.aio.run_io); cancelling the await sets the event
+cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "storage_cancel_event", default=None
+)
+
+
+def check_cancelled() -> None:
+    """Stop blocking storage work whose caller has been cancelled."""
+    event = cancel_event.get()
+    if event is not None and event.is_set():
+        raise asyncio.CancelledError()
@@ -0,0 +1,241 @@
+"""Index of saved sessions for fast, filtered listing."""
+
+import json
+import os
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from mi_trainer.config import SESSION_INDEX_PATH, SESSION_PAGE_SIZE, SESSIONS_DIR
+from mi_trainer.storage.cancellation import check_cancelled
+from mi_trainer.storage.sessions import journal_path, read_journal
+
+try:
+    import sqlite3
+except ImportError:  # Python built without SQLite: list by reading every file
+    sqlite3 = None
+
+
+class SessionInfo(BaseModel):
+    """What the session list shows about a saved session."""
+
+    path: Path
+    scenario_id: str
+    scenario_name: str
+    created_at: datetime
+    updated_at: datetime
+    node_count: int
+    current_id: Optional[str] = None
+
+
+def read_session_info(filepath: Path) -> SessionInfo:
+    """Read a session file's metadata, counting changes in its journal.
+
+    The file is parsed as plain JSON; nothing is validated beyond the
+    metadata itself.
+    """
+    with open(filepath) as f:
+        data = json.load(f)
+    scenario = data.get("scenario", {})
+    conversation = data.get("conversation", {})
+    nodes = conversation.get("nodes", {})
+    node_count = len(nodes)
+    current_id = conversation.get("current_id")
+
+    for change in read_journal(journal_path(filepath)):
+        if change["op"] == "add" and change["id"] not in nodes:
+            node_count += 1
+        if change["op"] in ("add", "goto"):
+            current_id = change["id"]
+
+    return SessionInfo(
+        path=filepath,
+        scenario_id=scenario.get("id", ""),
+        scenario_name=scenario.get("name", "Unknown"),
+        created_at=data["created_at"],
+        updated_at=data.get("updated_at", data["created_at"]),
+        node_count=node_count,
+        current_id=current_id,
+    )
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    scenario_id TEXT NOT NULL,
+    scenario_name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    node_count INTEGER NOT NULL,
+    current_id TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_by_created ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS sessions_by_scenario ON sessions (scenario_name COLLATE NOCASE, created_at);
+"""
+
+COLUMNS = "path, scenario_id, scenario_name, created_at, updated_at, node_count, current_id"
+
+
+class SessionIndex:
+    """Session metadata in SQLite, kept in step with the session files.
+
+    Each listing first compares the modification times of the session
+    files (and their journals) with the index, which takes one directory
+    scan, and re-reads only files that changed. Listings are then indexed
+    queries, so paging through thousands of sessions is instant.
+    """
+
+    def __init__(self, directory: Path = SESSIONS_DIR, db_path: Path = SESSION_INDEX_PATH):
+        self.directory = directory
+        self.db_path = db_path
+        with closing(self._connect()) as db, db:
+            db.executescript(SCHEMA)
+
+    def _connect(self) -> "sqlite3.Connection":
+        # A connection per call: listings run on whichever storage thread is free
+        return sqlite3.connect(self.db_path)
+
+    def _scan(self) -> dict[str, float]:
+        """Session files and the newest modification time of each file or its journal."""
+        times: dict[str, float] = {}
+        journals: dict[str, float] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json"):
+                    times[entry.path] = entry.stat().st_mtime
+                elif entry.name.endswith(".journal"):
+                    journals[entry.path[: -len(".journal")] + ".json"] = entry.stat().st_mtime
+        for path, mtime in journals.items():
+            if path in times:
+                times[path] = max(times[path], mtime)
+        return times
+
+    def sync(self) -> None:
+        """Bring the index up to date with the session files."""
+        times = self._scan()
+        with closing(self._connect()) as db, db:
+            indexed = dict(db.execute("SELECT path, mtime FROM sessions"))
+            removed = [(path,) for path in indexed if path not in times]
+            db.executemany("DELETE FROM sessions WHERE path = ?", removed)
+
+            for path, mtime in times.items():
+                if indexed.get(path) == mtime:
+                    continue
+                check_cancelled()
+                try:
+                    info = read_session_info(Path(path))
+                except (OSError, json.JSONDecodeError, KeyError, ValueError):
+                    db.execute("DELETE FROM sessions WHERE path = ?", (path,))
+                    continue
+                db.execute(
+                    f"INSERT OR REPLACE INTO sessions (mtime, {COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        mtime,
+                        path,
+                        info.scenario_id,
+                        info.scenario_name,
+                        info.created_at.isoformat(),
+                        info.updated_at.isoformat(),
+                        info.node_count,
+                        info.current_id,
+                    ),
+                )
+
+    def find(
+        self,
+        scenario: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = SESSION_PAGE_SIZE,
+        offset: int = 0,
+    ) -> tuple[list[SessionInfo], int]:
+        """One page of sessions, newest first, and how many match in total.
+
+        `scenario` matches part of the scenario's name or ID (ignoring
+        case); `since` and `until` bound the session's start time.
+        """
+        self.sync()
+        conditions, params = [], []
+        if scenario:
+            conditions.append("(scenario_name LIKE ? ESCAPE '\\' OR scenario_id LIKE ? ESCAPE '\\')")
+            pattern = scenario.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params += [f"%{pattern}%"] * 2
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until.isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with closing(self._connect()) as db:
+            total = db.execute(f"SELECT COUNT(*) FROM sessions {where}", params).fetchone()[0]
+            rows = db.execute(
+                f"SELECT {COLUMNS} FROM sessions {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        fields = COLUMNS.split(", ")
+        return [SessionInfo(**dict(zip(fields, row))) for row in rows], total
+
+
+def _find_unindexed(
+    scenario: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    limit: int,
+    offset: int,
+) -> tuple[list[SessionInfo], int]:
+    """`SessionIndex.find` without SQLite, reading every session file."""
+    matches = []
+    for filepath in SESSIONS_DIR.glob("*.json"):
+        check_cancelled()
+        try:
+            info = read_session_info(filepath)
+        except (OSError, json.JSONDecodeError, KeyError, ValueError):
+            continue
+        if scenario and scenario.lower() not in f"{info.scenario_name}\n{info.scenario_id}".lower():
+            continue
+        if (since is not None and info.created_at < since) or (until is not None and info.created_at >= until):
+            continue
+        matches.append(info)
+    matches.sort(key=lambda info: info.created_at, reverse=True)
+    return matches[offset:offset + limit], len(matches)
+
+
+_index: Optional[SessionIndex] = None
+
+
+def get_session_index() -> Optional[SessionIndex]:
+    """Get the session index, or None if SQLite is not available or the index can't be opened."""
+    global _index
+    if _index is None and sqlite3 is not None:
+        try:
+            _index = SessionIndex()
+        except sqlite3.Error:
+            return None
+    return _index
+
+
+def find_sessions(
+    scenario: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = SESSION_PAGE_SIZE,
+    offset: int = 0,
+) -> tuple[list[SessionInfo], int]:
+    """One page of saved sessions, newest first, and how many match in total.
+
+    If the index fails (locked by another listing, read-only or corrupt),
+    every session file is read instead.
+    """
+    index = get_session_index()
+    if index is not None:
+        try:
+            return index.find(scenario, since, until, limit, offset)
+        except sqlite3.Error:
+            pass
+    return _find_unindexed(scenario, since, until, limit, offset)
@@ -0,0 +1,56 @@
+"""Offsets of the parts of a saved session file, for reading parts of it."""
+
+import json
+import re
+from typing import Any
+
+# A node's key within `nodes`, up to the brace opening its record
+NODE_KEY = re.compile(r'\n {6}"([^"\\]+)": \{')
+
+_decoder = json.JSONDecoder()
+
+
+class SessionOffsets:
+    """Where each node and top-level value sits in a session file's text.
+
+    Session files are written with two-space indentation, and JSON strings
+    cannot contain raw line breaks, so every line break is structure: the
+    lines indented by exactly six spaces within `nodes` are the node keys.
+    One regular-expression pass over the text finds them all, which is far
+    cheaper than decoding and validating every node; single values are then
+    decoded where they sit.
+
+    Raises ValueError for text not laid out that way.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        start = self._find('\n    "nodes": {', self._find('\n  "conversation": {'))
+        end = self._find('\n    "root_id": ', start)
+        self.nodes = {match.group(1): match.end() - 1 for match in NODE_KEY.finditer(text, start, end)}
+        self._conversation_end = end
+
+    def _find(self, pattern: str, start: int = 0) -> int:
+        """The offset just past `pattern`."""
+        index = self.text.find(pattern, start)
+        if index < 0:
+            raise ValueError(f"Not a session file as saved: no {pattern.strip()!r}")
+        return index + len(pattern)
+
+    def _decode(self, offset: int) -> Any:
+        try:
+            return _decoder.raw_decode(self.text, offset)[0]
+        except json.JSONDecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def value(self, key: str) -> Any:
+        """A top-level value of the session, such as `scenario` or `created_at`."""
+        return self._decode(self._find(f'\n  "{key}": '))
+
+    def current_id(self) -> Any:
+        """The conversation's current node ID."""
+        return self._decode(self._find('\n    "current_id": ', self._conversation_end))
+
+    def node(self, node_id: str) -> dict:
+        """A node's saved record, as plain JSON data (KeyError if there is none)."""
+        return self._decode(self.nodes[node_id])
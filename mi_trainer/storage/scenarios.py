@@ -2,16 +2,19 @@
 
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from mi_trainer.config import BUILTIN_SCENARIOS_DIR, USER_SCENARIOS_DIR
-from mi_trainer.models.scenario import Scenario
+from mi_trainer.models.scenario import Ambivalence, Scenario
+from mi_trainer.storage.cancellation import check_cancelled
+from mi_trainer.storage.trusted import dump_json, load_json
 
 
 def list_builtin_scenarios() -> list[Scenario]:
     """List all built-in scenarios."""
     scenarios = []
     for filepath in BUILTIN_SCENARIOS_DIR.glob("*.json"):
+        check_cancelled()
         try:
             scenarios.append(load_scenario_from_file(filepath))
         except (json.JSONDecodeError, ValueError):
@@ -23,6 +26,7 @@ def list_user_scenarios() -> list[Scenario]:
     """List all user-created scenarios."""
     scenarios = []
     for filepath in USER_SCENARIOS_DIR.glob("*.json"):
+        check_cancelled()
         try:
             scenarios.append(load_scenario_from_file(filepath))
         except (json.JSONDecodeError, ValueError):
@@ -36,12 +40,19 @@ def list_all_scenarios() -> list[Scenario]:
 
 
 def load_scenario_from_file(filepath: Path) -> Scenario:
-    """Load a scenario from a JSON file."""
+    """Load a scenario from a JSON file, validating it unless it is trusted."""
     with open(filepath) as f:
-        data = json.load(f)
+        data, trusted = load_json(f.read())
+    if trusted:
+        return construct_scenario(data)
     return Scenario(**data)
 
 
+def construct_scenario(data: dict[str, Any]) -> Scenario:
+    """Build a scenario from trusted JSON data (see `storage.trusted`) without validation."""
+    return Scenario.model_construct(**{**data, "ambivalence": Ambivalence.model_construct(**data["ambivalence"])})
+
+
 def load_scenario_by_id(scenario_id: str) -> Optional[Scenario]:
     """Load a scenario by its ID."""
     # Check built-in scenarios first
@@ -66,13 +77,17 @@ def load_scenario_by_name(name: str) -> Optional[Scenario]:
     return None
 
 
+def user_scenario_path(scenario: Scenario) -> Path:
+    """Where a user scenario is saved."""
+    return USER_SCENARIOS_DIR / f"{scenario.id}.json"
+
+
 def save_user_scenario(scenario: Scenario) -> Path:
     """Save a scenario to the user scenarios directory."""
-    filename = f"{scenario.id}.json"
-    filepath = USER_SCENARIOS_DIR / filename
+    filepath = user_scenario_path(scenario)
 
     with open(filepath, "w") as f:
-        f.write(scenario.model_dump_json(indent=2))
+        f.write(dump_json(scenario))
 
     return filepath
 
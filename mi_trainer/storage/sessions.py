@@ -1,15 +1,22 @@
 """Session storage for conversation trees."""
 
 import json
+import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 from pydantic import BaseModel
 
-from mi_trainer.config import SESSIONS_DIR
+from mi_trainer.config import JOURNAL_COMPACT_RECORDS, JOURNAL_SYNC_DELAY, SESSIONS_DIR
 from mi_trainer.models.conversation import ConversationTree
+from mi_trainer.models.node_store import Change, NodeRecord, NodeStore
 from mi_trainer.models.scenario import Scenario
+from mi_trainer.storage.cancellation import check_cancelled
+from mi_trainer.storage.offsets import SessionOffsets
+from mi_trainer.storage.scenarios import construct_scenario
+from mi_trainer.storage.trusted import dump_json, load_json
 
 
 class Session(BaseModel):
@@ -21,33 +28,301 @@ class Session(BaseModel):
     updated_at: datetime
 
 
+def session_path(session: Session, filename: Optional[str] = None) -> Path:
+    """Where a session is saved: `filename` in the sessions directory, or a name from its start time."""
+    if filename is not None:
+        return SESSIONS_DIR / filename
+    timestamp = session.created_at.strftime("%Y%m%d_%H%M%S")
+    safe_name = session.scenario.id.replace(" ", "_").lower()
+    return SESSIONS_DIR / f"{timestamp}_{safe_name}.json"
+
+
+def journal_path(filepath: Path) -> Path:
+    """The journal of changes made since a session file was written."""
+    return Path(filepath).with_suffix(".journal")
+
+
+def _write_atomic(filepath: Path, text: str) -> None:
+    """Replace a file so that a crash leaves either the old or the new contents."""
+    temp = filepath.with_name(filepath.name + ".tmp")
+    with open(temp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, filepath)
+
+
 def save_session(session: Session, filename: Optional[str] = None) -> Path:
     """Save a session to disk."""
-    if filename is None:
-        timestamp = session.created_at.strftime("%Y%m%d_%H%M%S")
-        safe_name = session.scenario.id.replace(" ", "_").lower()
-        filename = f"{timestamp}_{safe_name}.json"
-
-    filepath = SESSIONS_DIR / filename
+    filepath = session_path(session, filename)
     session.updated_at = datetime.now()
 
     with open(filepath, "w") as f:
-        f.write(session.model_dump_json(indent=2))
+        f.write(dump_json(session))
 
     return filepath
 
 
 def load_session(filepath: Path) -> Session:
-    """Load a session from disk."""
+    """Load a session from disk, replaying any journaled changes.
+
+    Files this tool saved and that have not changed since are trusted and
+    built without validation; others are validated in full.
+    """
+    with open(filepath) as f:
+        data, trusted = load_json(f.read())
+    session = construct_session(data) if trusted else Session(**data)
+    replay_journal(session, journal_path(filepath))
+    return session
+
+
+def construct_session(data: dict[str, Any]) -> Session:
+    """Build a session from trusted JSON data (see `storage.trusted`) without validation."""
+    conversation = data["conversation"]
+    return Session.model_construct(
+        scenario=construct_scenario(data["scenario"]),
+        conversation=ConversationTree.model_construct(
+            nodes=NodeStore.construct(conversation["nodes"]),
+            root_id=conversation["root_id"],
+            current_id=conversation["current_id"],
+        ),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        updated_at=datetime.fromisoformat(data["updated_at"]),
+    )
+
+
+def load_session_path(filepath: Path) -> Session:
+    """Load a session with only the messages on the path to its current node.
+
+    Just the scenario and the path's nodes are decoded and validated, found
+    through a `SessionOffsets` index of the file, so the time taken barely
+    grows with the size of the tree. Journaled changes are included. Load
+    the whole tree with `load_session`; files not laid out the way they are
+    saved are always loaded whole.
+    """
     with open(filepath) as f:
-        data = json.load(f)
-    return Session(**data)
+        text = f.read()
+    try:
+        offsets = SessionOffsets(text)
+        current_id = offsets.current_id()
+        changes = list(read_journal(journal_path(filepath)))
+        added = {change["id"]: change for change in changes if change["op"] == "add"}
+        for change in changes:
+            if change["op"] in ("add", "goto"):
+                current_id = change["id"]
+
+        # Walk up from the current node, taking journaled messages before saved ones
+        path: list[NodeRecord] = []
+        node_id = current_id
+        while node_id is not None:
+            if node_id in added:
+                change = added[node_id]
+                record = NodeRecord(
+                    id=node_id,
+                    role=change["role"],
+                    content=change["content"],
+                    timestamp=datetime.fromtimestamp(change["ts"]),
+                    parent_id=change["parent"],
+                )
+            else:
+                record = NodeRecord.model_validate(offsets.node(node_id))
+            path.append(record)
+            node_id = record.parent_id
+
+        conversation = ConversationTree(
+            nodes=NodeStore.from_records({record.id: record for record in reversed(path)}),
+            root_id=path[-1].id if path else None,
+            current_id=current_id,
+        )
+        for change in changes:
+            if change["op"] in ("feedback", "summary") and change["id"] in conversation.nodes:
+                conversation.apply_change(change)
+
+        return Session(
+            scenario=offsets.value("scenario"),
+            conversation=conversation,
+            created_at=offsets.value("created_at"),
+            updated_at=offsets.value("updated_at"),
+        )
+    except (KeyError, ValueError):
+        return load_session(filepath)
+
+
+def read_journal(path: Path) -> Iterator[Change]:
+    """The change records in a journal, if there is one."""
+    if not path.exists():
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # The last record was cut short by a crash
+                return
+
+
+def replay_journal(session: Session, path: Path) -> int:
+    """Apply a journal's changes to a session; returns how many were applied."""
+    count = 0
+    for change in read_journal(path):
+        session.conversation.apply_change(change)
+        count += 1
+    return count
+
+
+class SessionJournal:
+    """Append-only log of a session's changes, written in the background.
+
+    The journal watches the session's tree. Each change (a message, feedback
+    or a summary attached to a node, a move of the current node) is queued
+    as one compact JSON line, which is all the event loop ever does. A
+    writer thread appends queued lines to the session's `.journal` file and
+    fsyncs them JOURNAL_SYNC_DELAY after the first, so a turn's burst of
+    changes costs one sync. After JOURNAL_COMPACT_RECORDS records, on
+    `checkpoint` and on `close`, the thread folds the journal into the
+    session file, which is replaced atomically, and starts a new journal.
+
+    `load_session` replays the journal, so a crash loses at most the last
+    sync delay's worth of changes. Replaying is idempotent, so a crash
+    between replacing the session file and removing the journal is safe.
+
+    Constructing a journal touches no files; the writer thread checks for
+    the session file and counts existing records. A session given without
+    `filepath` is taken to be new (and so small): it is serialized now and
+    written out before its first change, unless its file already exists.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        filepath: Optional[Path] = None,
+        sync_delay: float = JOURNAL_SYNC_DELAY,
+        compact_records: int = JOURNAL_COMPACT_RECORDS,
+    ):
+        self.session = session
+        self.path = Path(filepath) if filepath is not None else session_path(session)
+        self.journal_path = journal_path(self.path)
+        self.sync_delay = sync_delay
+        self.compact_records = compact_records
+
+        # A new session is written out before its first change
+        self._snapshot = dump_json(session) if filepath is None else None
+        self._records = 0
+        self._pending: list[str] = []
+        self._checkpoints = 0
+        self._checkpointed = 0
+        self._closing = False
+        self._error: Optional[Exception] = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+        self._thread.start()
+        session.conversation.watch(self.append)
+
+    def _count_records(self) -> int:
+        if not self.journal_path.exists():
+            return 0
+        with open(self.journal_path) as f:
+            return sum(1 for _ in f)
+
+    def append(self, change: Change) -> None:
+        """Queue a change to be written."""
+        line = json.dumps(change, separators=(",", ":"))
+        with self._condition:
+            self._pending.append(line)
+            self._condition.notify()
+
+    def checkpoint(self) -> Path:
+        """Fold everything into the session file now; blocks until it is written."""
+        with self._condition:
+            self._checkpoints += 1
+            target = self._checkpoints
+            self._condition.notify_all()
+            self._condition.wait_for(
+                lambda: self._checkpointed >= target or not self._thread.is_alive()
+            )
+        if self._error is not None:
+            raise self._error
+        return self.path
+
+    def close(self, wait: bool = True) -> None:
+        """Stop journaling, writing and folding in whatever is still queued."""
+        self.session.conversation.watch(None)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if wait:
+            self._thread.join()
+
+    def _run(self) -> None:
+        if self.path.exists():
+            self._snapshot = None
+        try:
+            self._records = self._count_records()
+        except OSError as e:
+            self._error = e
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending or self._closing or self._checkpoints > self._checkpointed
+                )
+                # Let the rest of a burst of changes arrive before syncing
+                self._condition.wait_for(
+                    lambda: self._closing or self._checkpoints > self._checkpointed,
+                    timeout=self.sync_delay,
+                )
+                lines, self._pending = self._pending, []
+                checkpoint = self._checkpoints
+                closing = self._closing
+
+            requested = checkpoint > self._checkpointed
+            try:
+                self._write(lines, snapshot=requested)
+                lines = []
+                if closing or requested or self._records >= self.compact_records:
+                    self._compact()
+                self._error = None
+            except Exception as e:
+                # Kept for checkpoint to report (e.g. a session file that no longer
+                # loads); unwritten records stay queued for the next try
+                self._error = e
+                with self._condition:
+                    self._pending[:0] = lines
+            finally:
+                with self._condition:
+                    self._checkpointed = checkpoint
+                    self._condition.notify_all()
+            if closing:
+                return
+
+    def _write(self, lines: list[str], snapshot: bool = False) -> None:
+        """Append lines to the journal, first writing the session file if it is new."""
+        if self._snapshot is not None and (lines or snapshot):
+            _write_atomic(self.path, self._snapshot)
+            self._snapshot = None
+        if lines:
+            with open(self.journal_path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._records += len(lines)
+
+    def _compact(self) -> None:
+        """Rewrite the session file with the journal applied, then drop the journal."""
+        if not self._records:
+            return
+        session = load_session(self.path)
+        session.updated_at = datetime.now()
+        _write_atomic(self.path, dump_json(session))
+        self.journal_path.unlink(missing_ok=True)
+        self._records = 0
 
 
 def list_sessions() -> list[tuple[Path, str, datetime]]:
     """List all saved sessions with their names and dates."""
     sessions = []
     for filepath in SESSIONS_DIR.glob("*.json"):
+        check_cancelled()
         try:
             with open(filepath) as f:
                 data = json.load(f)
@@ -0,0 +1,47 @@
+"""Saved files stamped with a schema version and checksum, to skip re-validation."""
+
+import hashlib
+import json
+import re
+from typing import Any
+
+from pydantic import BaseModel
+
+# Bump when a saved model changes shape: files stamped with an older
+# version are then validated in full rather than trusted
+SCHEMA_VERSION = 1
+
+HEADER = re.compile(r'\{\n  "schema_version": (\d+),\n  "checksum": "([0-9a-f]{64})",')
+
+
+def _checksum(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def dump_json(model: BaseModel) -> str:
+    """A model as the JSON text to save, stamped with the schema version and a checksum.
+
+    The checksum covers the model's JSON, which follows the stamp.
+    """
+    body = model.model_dump_json(indent=2)
+    return f'{{\n  "schema_version": {SCHEMA_VERSION},\n  "checksum": "{_checksum(body)}",{body[1:]}'
+
+
+def load_json(text: str) -> tuple[dict[str, Any], bool]:
+    """Parse saved JSON text, and tell whether it can be trusted.
+
+    Text is trusted if it was written by `dump_json` with the current schema
+    version and has not changed since, so it is known to be valid and models
+    can be built from it with `model_construct`. Anything else (older or
+    hand-edited files, built-in scenarios) must be validated.
+    """
+    data = json.loads(text)
+    match = HEADER.match(text)
+    trusted = (
+        match is not None
+        and int(match.group(1)) == SCHEMA_VERSION
+        and _checksum("{" + text[match.end():]) == match.group(2)
+    )
+    data.pop("schema_version", None)
+    data.pop("checksum", None)
+    return data, trusted
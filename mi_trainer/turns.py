@@ -0,0 +1,100 @@
+"""Sequencing and cancellation of conversation turns."""
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+Job = Callable[[], Awaitable[None]]
+
+
+class TurnSupervisor:
+    """Runs a session's turns one at a time and cancels work that has gone stale.
+
+    Messages sent while a turn is running wait for it, and messages sent in a
+    row are merged into a single practitioner message. Other work that
+    produces a conversation node (the client's opening) is queued the same
+    way with `schedule`. Hints and debriefs run alongside the queue via
+    `run_aside` and are cancelled as soon as a new message is sent.
+
+    Call `cancel` whenever the position in the conversation tree changes
+    (rewind, goto, a new or loaded session): everything queued or in flight
+    is dropped, so no reply lands on whatever node happens to be current.
+    """
+
+    def __init__(
+        self,
+        handle_message: Callable[[str], Awaitable[None]],
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self._handle_message = handle_message
+        self._on_error = on_error
+        self._queue: deque[str | Job] = deque()
+        self._worker: Optional[asyncio.Task] = None
+        self._aside: Optional[asyncio.Task] = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether a turn is running or queued."""
+        return self._worker is not None and not self._worker.done()
+
+    def submit(self, text: str) -> bool:
+        """Queue a practitioner message; returns True if it has to wait for a running turn."""
+        self.cancel_aside()
+        waiting = self.busy
+        if self._queue and isinstance(self._queue[-1], str):
+            self._queue[-1] = f"{self._queue[-1]}\n\n{text}"
+        else:
+            self._queue.append(text)
+        self._start()
+        return waiting
+
+    def schedule(self, job: Job) -> None:
+        """Queue other work that must not interleave with turns."""
+        self._queue.append(job)
+        self._start()
+
+    def _start(self) -> None:
+        if not self.busy:
+            self._worker = asyncio.create_task(self._work())
+
+    async def _work(self) -> None:
+        while self._queue:
+            item = self._queue.popleft()
+            try:
+                if isinstance(item, str):
+                    await self._handle_message(item)
+                else:
+                    await item()
+            except Exception as e:
+                if self._on_error is None:
+                    raise
+                self._on_error(e)
+
+    async def run_aside(self, job: Awaitable[None]) -> None:
+        """Run a hint or debrief until done, superseded, or cancelled by a new message."""
+        self.cancel_aside()
+        task = asyncio.ensure_future(job)
+        self._aside = task
+        try:
+            await task
+        except asyncio.CancelledError:
+            # Our own caller being cancelled must propagate; a superseded aside just stops
+            if asyncio.current_task().cancelling():
+                raise
+        finally:
+            if self._aside is task:
+                self._aside = None
+
+    def cancel_aside(self) -> None:
+        """Stop any hint or debrief still running."""
+        if self._aside is not None and not self._aside.done():
+            self._aside.cancel()
+        self._aside = None
+
+    def cancel(self) -> None:
+        """Drop all queued and in-flight work."""
+        self._queue.clear()
+        if self.busy:
+            self._worker.cancel()
+        self._worker = None
+        self.cancel_aside()
@@ -4,5 +4,6 @@ from mi_trainer.ui.layout import AppLayout
 from mi_trainer.ui.conversation_pane import ConversationPane
 from mi_trainer.ui.feedback_pane import FeedbackPane
 from mi_trainer.ui.input_area import InputArea
+from mi_trainer.ui.render import RenderScheduler
 
-__all__ = ["AppLayout", "ConversationPane", "FeedbackPane", "InputArea"]
+__all__ = ["AppLayout", "ConversationPane", "FeedbackPane", "InputArea", "RenderScheduler"]
@@ -1,125 +1,161 @@
 """Conversation pane displaying the dialogue."""
 
-import shutil
-import textwrap
-
-from prompt_toolkit.formatted_text import FormattedText, HTML
-from prompt_toolkit.layout import ScrollablePane
-from prompt_toolkit.layout.controls import FormattedTextControl
-from prompt_toolkit.layout.containers import Window
+from typing import Optional
 
 from mi_trainer.models.conversation import ConversationTree, ConversationNode
+from mi_trainer.ui.virtual import FixedBlock, LineView, TextBlock, line_view_window
+from mi_trainer.ui.wrapping import WrappedText
+
+
+LABELS = {
+    "client": ("class:conversation.client-label", "Client: "),
+    "user": ("class:conversation.user-label", "You: "),
+}
+LABEL_WIDTH = max(len(label) for _, label in LABELS.values())
 
 
 class ConversationPane:
     """Displays the conversation between user and client."""
 
     def __init__(self):
-        self._content: list[tuple[str, str]] = []
-        self._streaming_text = ""
-        self._streaming_role = ""
-        self._wrap_width = 70  # Will be updated dynamically
-        self.control = FormattedTextControl(
-            text=self._get_formatted_text,
-            focusable=False,
+        # One block per message; only the lines on screen are rendered
+        self.view = LineView(
+            placeholder=[("class:conversation.message", "Start the conversation by typing below...")]
         )
-        self.window = Window(
-            content=self.control,
-            wrap_lines=False,  # We handle wrapping ourselves
+        self._streaming: Optional[TextBlock] = None
+        self._has_branch_indicator = False
+        # Node ids of the message blocks shown, in order, and their positions
+        self._path: list[Optional[str]] = []
+        self._positions: dict[str, int] = {}
+        # Blocks of every node shown so far, kept wrapped for branch switching
+        self._node_blocks: dict[str, TextBlock] = {}
+        self.window = line_view_window(self.view)
+        self.container = self.window
+
+    @staticmethod
+    def _message_block(role: str, text: WrappedText) -> TextBlock:
+        return TextBlock(
+            "class:conversation.message",
+            text,
+            prefix=LABELS["client" if role == "client" else "user"],
+            blank_before=True,
+            width_offset=LABEL_WIDTH,
         )
-        self.container = ScrollablePane(self.window)
-
-    def _wrap_text(self, text: str) -> str:
-        """Wrap text at word boundaries."""
-        # Get terminal width and use ~65% for conversation pane
-        try:
-            term_width = shutil.get_terminal_size().columns
-            self._wrap_width = max(40, int(term_width * 0.65) - 10)
-        except Exception:
-            self._wrap_width = 70
-
-        # Wrap each paragraph separately to preserve intentional line breaks
-        paragraphs = text.split('\n')
-        wrapped = []
-        for para in paragraphs:
-            if para.strip():
-                wrapped.append(textwrap.fill(para, width=self._wrap_width))
-            else:
-                wrapped.append('')
-        return '\n'.join(wrapped)
-
-    def _get_formatted_text(self) -> FormattedText:
-        """Generate the formatted text for display."""
-        result = list(self._content)
-
-        # Add streaming content if present (wrap it too)
-        if self._streaming_text:
-            wrapped = self._wrap_text(self._streaming_text)
-            if self._streaming_role == "client":
-                result.append(("class:conversation.client-label", "\nClient: "))
-                result.append(("class:conversation.message", wrapped))
-            else:
-                result.append(("class:conversation.user-label", "\nYou: "))
-                result.append(("class:conversation.message", wrapped))
-
-        if not result:
-            result.append(("class:conversation.message", "Start the conversation by typing below..."))
-
-        return FormattedText(result)
 
-    def load_conversation(self, tree: ConversationTree) -> None:
-        """Load a conversation tree into the pane."""
-        self._content = []
-        path = tree.get_path_to_current()
+    def _remove_branch_indicator(self) -> None:
+        if self._has_branch_indicator:
+            self.view.truncate(len(self.view.blocks) - 1)
+            self._has_branch_indicator = False
 
-        for node in path:
+    def load_conversation(self, tree: ConversationTree) -> None:
+        """Show the tree's current path, rebuilding only what changed.
+
+        Messages above the lowest common ancestor of the shown path and the
+        new one stay as they are; only the diverging suffix is replaced, from
+        blocks kept for every node already shown. Switching branches costs
+        time proportional to the branches, not to the whole conversation.
+        """
+        self._remove_branch_indicator()
+        self.discard_streaming()
+
+        # Walk up from the current node to the deepest node still shown
+        new_nodes = []
+        node_id = tree.current_id
+        while node_id is not None and node_id not in self._positions:
+            node = tree.nodes[node_id]
+            new_nodes.append(node)
+            node_id = node.parent_id
+
+        keep = self._positions[node_id] + 1 if node_id is not None else 0
+        self._truncate(keep)
+        for node in reversed(new_nodes):
             self._add_node(node)
 
         # Check for branches
-        branches = tree.get_branches_at_current()
-        if len(branches) > 1:
-            self._content.append(("class:conversation.branch-indicator", f"\n[{len(branches)} branches from here]"))
+        branch_count = len(tree.get_branches_at_current())
+        if branch_count > 1:
+            self.view.append(FixedBlock([
+                [],
+                [("class:conversation.branch-indicator", f"[{branch_count} branches from here]")],
+            ]))
+            self._has_branch_indicator = True
+
+    def _truncate(self, keep: int) -> None:
+        """Remove all messages after the first `keep`."""
+        for node_id in self._path[keep:]:
+            if node_id is not None:
+                del self._positions[node_id]
+        del self._path[keep:]
+        self.view.truncate(keep)
 
     def _add_node(self, node: ConversationNode) -> None:
-        """Add a node to the display."""
-        if node.role == "client":
-            self._content.append(("class:conversation.client-label", "\nClient: "))
-        else:
-            self._content.append(("class:conversation.user-label", "\nYou: "))
-
-        self._content.append(("class:conversation.message", self._wrap_text(node.content)))
-        self._content.append(("", "\n"))
-
-    def add_message(self, role: str, content: str) -> None:
-        """Add a complete message to the display."""
-        if role == "client":
-            self._content.append(("class:conversation.client-label", "\nClient: "))
-        else:
-            self._content.append(("class:conversation.user-label", "\nYou: "))
-
-        self._content.append(("class:conversation.message", self._wrap_text(content)))
-        self._content.append(("", "\n"))
+        """Add a node to the display, reusing its block if it was shown before."""
+        block = self._node_blocks.get(node.id)
+        if block is None:
+            block = self._message_block(node.role, WrappedText(node.content))
+        self._append(block, node.id)
+
+    def _append(self, block: TextBlock, node_id: Optional[str]) -> None:
+        self.view.append(block)
+        self._record(block, node_id)
+
+    def _record(self, block: TextBlock, node_id: Optional[str]) -> None:
+        """Note that the last block shown is the message for `node_id`."""
+        if node_id is not None:
+            self._positions[node_id] = len(self._path)
+            self._node_blocks[node_id] = block
+        self._path.append(node_id)
+
+    def add_message(self, role: str, content: str, node_id: Optional[str] = None) -> None:
+        """Add a complete message to the display, for the tree node `node_id` if given."""
+        self._remove_branch_indicator()
+        self._append(self._message_block(role, WrappedText(content)), node_id)
 
     def start_streaming(self, role: str) -> None:
         """Start streaming a new message."""
-        self._streaming_role = role
-        self._streaming_text = ""
+        self._remove_branch_indicator()
+        self._streaming = self._message_block(role, WrappedText())
+
+    def _streaming_shown(self) -> bool:
+        return bool(self.view.blocks) and self.view.blocks[-1] is self._streaming
 
     def append_streaming(self, text: str) -> None:
-        """Append text to the streaming message."""
-        self._streaming_text += text
-
-    def finish_streaming(self) -> str:
-        """Finish streaming and commit the message."""
-        content = self._streaming_text
-        if content:
-            self.add_message(self._streaming_role, content)
-        self._streaming_text = ""
-        self._streaming_role = ""
+        """Append text to the streaming message, wrapping only the new text."""
+        if self._streaming is None:
+            return
+        if not self._streaming_shown():
+            # Shown from its first chunk on
+            self.view.append(self._streaming)
+        self._streaming.text.append(text)
+        self.view.changed()
+
+    def finish_streaming(self, node_id: Optional[str] = None) -> str:
+        """Finish streaming and commit the message, keeping its wrapped lines."""
+        if self._streaming is None:
+            return ""
+        content = self._streaming.text.text
+        if content and self._streaming_shown():
+            self._record(self._streaming, node_id)
+        else:
+            self.discard_streaming()
+        self._streaming = None
         return content
 
+    def discard_streaming(self) -> None:
+        """Drop a streamed message that will not be kept."""
+        if self._streaming is not None and self._streaming_shown():
+            self.view.truncate(len(self.view.blocks) - 1)
+        self._streaming = None
+
+    def scroll(self, delta: int) -> None:
+        """Scroll by `delta` lines (negative is up)."""
+        self.view.scroll(delta)
+
     def clear(self) -> None:
         """Clear the conversation display."""
-        self._content = []
-        self._streaming_text = ""
-        self._streaming_role = ""
+        self.view.clear()
+        self._streaming = None
+        self._has_branch_indicator = False
+        self._path = []
+        self._positions = {}
+        self._node_blocks = {}
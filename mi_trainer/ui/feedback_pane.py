@@ -1,124 +1,284 @@
 """Feedback pane displaying coach analysis."""
 
-import shutil
-import textwrap
-
-from prompt_toolkit.formatted_text import FormattedText
-from prompt_toolkit.layout import ScrollablePane
-from prompt_toolkit.layout.controls import FormattedTextControl
-from prompt_toolkit.layout.containers import Window
+from collections import deque
+from typing import Callable, Optional
 
+from mi_trainer.config import FEEDBACK_PAGE_SIZE, FEEDBACK_SCROLLBACK
 from mi_trainer.models.feedback import CoachFeedback
+from mi_trainer.ui.virtual import Block, FixedBlock, LineView, TextBlock, line_view_window
+from mi_trainer.ui.wrapping import WrappedText
+
+# Bullet markers for MI-consistent (good), MI-inconsistent (issues) and suggestions
+MARKERS = {
+    "mi_consistent": ("class:feedback.good", "+ "),
+    "mi_inconsistent": ("class:feedback.bad", "- "),
+    "suggestions": ("class:feedback.suggestion", "> "),
+}
+
+# Practitioner message and the coach's feedback on it, oldest first
+FeedbackHistory = Callable[[], list[tuple[str, CoachFeedback]]]
+
+
+class _Entry:
+    """Blocks shown and evicted together: one feedback block, hint, debrief or notice."""
+
+    def __init__(self, feedback: bool = False):
+        self.blocks: list[Block] = []
+        self.feedback = feedback
 
 
 class FeedbackPane:
-    """Displays MI coaching feedback."""
+    """Displays MI coaching feedback.
+
+    Only the last FEEDBACK_SCROLLBACK entries are kept. Scrolling to the top
+    pages in older coach feedback from the session through `history`, which
+    the app sets; paged-in feedback is dropped again when entries are next
+    evicted.
+    """
 
     def __init__(self):
-        self._content: list[tuple[str, str]] = []
-        self._streaming_text = ""
-        self._is_streaming = False
-        self._wrap_width = 35
-        self.control = FormattedTextControl(
-            text=self._get_formatted_text,
-            focusable=False,
-        )
-        self.window = Window(
-            content=self.control,
-            wrap_lines=False,  # We handle wrapping ourselves
-        )
-        self.container = ScrollablePane(self.window)
-
-    def _wrap_text(self, text: str, indent: str = "") -> str:
-        """Wrap text at word boundaries."""
-        try:
-            term_width = shutil.get_terminal_size().columns
-            self._wrap_width = max(25, int(term_width * 0.30) - 5)
-        except Exception:
-            self._wrap_width = 35
-
-        paragraphs = text.split('\n')
-        wrapped = []
-        for para in paragraphs:
-            if para.strip():
-                wrapped.append(textwrap.fill(
-                    para,
-                    width=self._wrap_width,
-                    initial_indent=indent,
-                    subsequent_indent=indent + "  "
-                ))
-            else:
-                wrapped.append('')
-        return '\n'.join(wrapped)
+        self.view = LineView(placeholder=[("class:feedback.note", "Coach feedback will appear here...")])
+        self.view.on_top = self._page_in
+        self.history: Optional[FeedbackHistory] = None
+        self._entries: deque[_Entry] = deque()
+        self._paged_blocks = 0
+        self._paged_feedback = 0
+        self._feedback_entry: Optional[_Entry] = None
+        self._feedback_items = 0
+        self._techniques: Optional[TextBlock] = None
+        self._provisional: Optional[_Entry] = None
+        self._stream_entry: Optional[_Entry] = None
+        self._partial: Optional[TextBlock] = None
+        self.window = line_view_window(self.view)
+        self.container = self.window
+
+    # Entries
+
+    def _start_entry(self, feedback: bool = False) -> _Entry:
+        while len(self._entries) >= FEEDBACK_SCROLLBACK:
+            oldest = self._entries.popleft()
+            self.view.remove(0, self._paged_blocks + len(oldest.blocks))
+            self._paged_blocks = self._paged_feedback = 0
+        entry = _Entry(feedback)
+        self._entries.append(entry)
+        return entry
+
+    def _entry_start(self, entry: _Entry) -> Optional[int]:
+        """Index of the entry's first block in the view, or None once evicted."""
+        index = self._paged_blocks
+        for other in self._entries:
+            if other is entry:
+                return index
+            index += len(other.blocks)
+        return None
+
+    def _add(self, entry: Optional[_Entry], *blocks: Block) -> None:
+        """Add blocks at the end of an entry (which may not be the newest)."""
+        start = self._entry_start(entry) if entry is not None else None
+        if start is None:
+            return
+        self.view.insert(start + len(entry.blocks), blocks)
+        entry.blocks.extend(blocks)
 
-    def _get_formatted_text(self) -> FormattedText:
-        """Generate the formatted text for display."""
-        result = list(self._content)
+    def _changed(self, entry: Optional[_Entry], block: Block) -> None:
+        """Note that a block of an entry grew."""
+        start = self._entry_start(entry) if entry is not None else None
+        if start is not None and block in entry.blocks:
+            self.view.changed(start + entry.blocks.index(block))
 
-        if self._is_streaming:
-            result.append(("class:feedback.note", f"\n{self._streaming_text}"))
+    def _remove(self, entry: _Entry, block: Block) -> None:
+        start = self._entry_start(entry)
+        if start is not None and block in entry.blocks:
+            index = entry.blocks.index(block)
+            self.view.remove(start + index, start + index + 1)
+            del entry.blocks[index]
 
-        if not result:
-            result.append(("class:feedback.note", "Coach feedback will appear here..."))
+    # Blocks
 
-        return FormattedText(result)
+    @staticmethod
+    def _header(text: str, style: str = "class:feedback.header") -> FixedBlock:
+        return FixedBlock([[], [(style, text)]])
+
+    @staticmethod
+    def _text(
+        style: str,
+        text: str,
+        prefix: tuple[str, str] = ("", ""),
+        blank_before: bool = False,
+    ) -> TextBlock:
+        """Text wrapped at word boundaries (lazily, at render time)."""
+        return TextBlock(style, WrappedText(text, subsequent_indent="  "), prefix, blank_before)
+
+    def _item_block(self, field: str, value: str) -> Optional[TextBlock]:
+        if field in MARKERS:
+            return self._text("class:feedback.note", value, prefix=MARKERS[field])
+        if field == "overall_note" and value:
+            return self._text("class:feedback.note", value, blank_before=True)
+        return None
+
+    def _feedback_blocks(self, message: str, feedback: CoachFeedback) -> list[Block]:
+        """A complete feedback block for an earlier turn, paged in from the session."""
+        blocks: list[Block] = [
+            self._header("--- Earlier Feedback ---"),
+            self._text("class:feedback.note", message, prefix=("class:feedback.technique", "You: ")),
+        ]
+        if feedback.techniques_used:
+            blocks.append(self._text(
+                "class:feedback.note",
+                ", ".join(feedback.techniques_used),
+                prefix=("class:feedback.technique", "Techniques: "),
+            ))
+        for field in ("mi_consistent", "mi_inconsistent", "suggestions"):
+            blocks.extend(self._item_block(field, item) for item in getattr(feedback, field))
+        note = self._item_block("overall_note", feedback.overall_note)
+        if note is not None:
+            blocks.append(note)
+        return blocks
+
+    def _page_in(self) -> None:
+        """Show the coach feedback from before the oldest feedback still in view."""
+        if self.history is None:
+            return
+        history = self.history()
+        shown = sum(entry.feedback for entry in self._entries) + self._paged_feedback
+        end = len(history) - shown
+        if end <= 0:
+            return
+        page = history[max(0, end - FEEDBACK_PAGE_SIZE):end]
+        blocks = [block for message, feedback in page for block in self._feedback_blocks(message, feedback)]
+        self.view.insert(0, blocks)
+        self._paged_blocks += len(blocks)
+        self._paged_feedback += len(page)
+
+    # Coach feedback
 
     def show_feedback(self, feedback: CoachFeedback) -> None:
         """Display parsed feedback."""
-        self._content.append(("class:feedback.header", "\n--- Coach Feedback ---\n"))
+        self.start_feedback()
+        self.finish_feedback(feedback)
 
-        # Techniques used
-        if feedback.techniques_used:
-            self._content.append(("class:feedback.technique", "Techniques: "))
-            self._content.append(("class:feedback.note", ", ".join(feedback.techniques_used)))
-            self._content.append(("", "\n"))
-
-        # MI-consistent (good)
-        for item in feedback.mi_consistent:
-            self._content.append(("class:feedback.good", "+ "))
-            self._content.append(("class:feedback.note", f"{self._wrap_text(item)}\n"))
-
-        # MI-inconsistent (issues)
-        for item in feedback.mi_inconsistent:
-            self._content.append(("class:feedback.bad", "- "))
-            self._content.append(("class:feedback.note", f"{self._wrap_text(item)}\n"))
-
-        # Suggestions
-        for item in feedback.suggestions:
-            self._content.append(("class:feedback.suggestion", "> "))
-            self._content.append(("class:feedback.note", f"{self._wrap_text(item)}\n"))
-
-        # Overall note
-        if feedback.overall_note:
-            self._content.append(("class:feedback.note", f"\n{self._wrap_text(feedback.overall_note)}\n"))
-
-    def start_streaming(self) -> None:
-        """Start streaming feedback."""
-        self._is_streaming = True
-        self._streaming_text = ""
-        self._content.append(("class:feedback.header", "\n--- Coach Feedback ---\n"))
+    def start_feedback(self, header: str = "Coach Feedback") -> None:
+        """Start a feedback block whose items are added as they arrive."""
+        self._feedback_entry = self._start_entry(feedback=True)
+        self._add(self._feedback_entry, self._header(f"--- {header} ---"))
+        self._feedback_items = 0
+        self._techniques = None
+
+    def show_provisional(self, feedback: CoachFeedback) -> None:
+        """Display quick local feedback, to be replaced by `clear_provisional`."""
+        self.start_feedback("Quick Check")
+        self.finish_feedback(feedback)
+        self._provisional = self._feedback_entry
+        self._provisional.feedback = False
+
+    def clear_provisional(self) -> None:
+        """Remove the provisional feedback block, if one is showing."""
+        if self._provisional is None:
+            return
+        start = self._entry_start(self._provisional)
+        if start is not None:
+            self.view.remove(start, start + len(self._provisional.blocks))
+            self._entries.remove(self._provisional)
+        self._provisional = None
+
+    def add_feedback_item(self, field: str, value: str) -> None:
+        """Render one feedback entry (a technique, observation, suggestion or note)."""
+        self._feedback_items += 1
+
+        # Techniques share a single line, extended as each one arrives
+        if field == "techniques_used":
+            if self._techniques is not None:
+                self._techniques.text.append(f", {value}")
+                self._changed(self._feedback_entry, self._techniques)
+            else:
+                self._techniques = self._text(
+                    "class:feedback.note", value, prefix=("class:feedback.technique", "Techniques: ")
+                )
+                self._add(self._feedback_entry, self._techniques)
+            return
+        self._techniques = None
+
+        block = self._item_block(field, value)
+        if block is not None:
+            self._add(self._feedback_entry, block)
+
+    def finish_feedback(self, feedback: CoachFeedback) -> None:
+        """Complete a feedback block.
+
+        If nothing was rendered progressively (e.g. the stream could not be
+        parsed incrementally), the whole feedback is rendered now.
+        """
+        if self._feedback_items == 0:
+            for technique in feedback.techniques_used:
+                self.add_feedback_item("techniques_used", technique)
+            for field in ("mi_consistent", "mi_inconsistent", "suggestions"):
+                for item in getattr(feedback, field):
+                    self.add_feedback_item(field, item)
+            self.add_feedback_item("overall_note", feedback.overall_note)
+        self._techniques = None
+
+    # Streamed text
+
+    def start_streaming(self, header: str = "Coach Feedback") -> None:
+        """Start a block of streamed markdown text (a hint or debrief)."""
+        self._stream_entry = self._start_entry()
+        self._partial = self._text("class:feedback.note", "")
+        self._add(self._stream_entry, self._header(f"--- {header} ---"), self._partial)
 
     def append_streaming(self, text: str) -> None:
-        """Append text to streaming feedback."""
-        self._streaming_text += text
+        """Append streamed text, rendering each line as soon as it is complete."""
+        if self._partial is None:
+            return
+        lines = (self._partial.text.text + text).split("\n")
+        if len(lines) == 1:
+            self._partial.text.append(text)
+            self._changed(self._stream_entry, self._partial)
+            return
+        # Complete lines go before the partial last line, which starts over
+        self._remove(self._stream_entry, self._partial)
+        for line in lines[:-1]:
+            self._add_markdown_line(line)
+        self._partial = self._text("class:feedback.note", lines[-1])
+        self._add(self._stream_entry, self._partial)
 
-    def finish_streaming(self) -> str:
-        """Finish streaming feedback."""
-        content = self._streaming_text
-        self._is_streaming = False
-        self._streaming_text = ""
-        return content
+    def finish_streaming(self) -> None:
+        """Finish streaming, rendering any partial last line."""
+        if self._partial is not None:
+            self._remove(self._stream_entry, self._partial)
+            self._add_markdown_line(self._partial.text.text)
+        self._partial = None
+        self._stream_entry = None
+
+    def _add_markdown_line(self, line: str) -> None:
+        """Render one line of a streamed markdown response."""
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            self._add(self._stream_entry, self._header(stripped.lstrip("#").strip(), "class:feedback.section"))
+        elif stripped:
+            self._add(self._stream_entry, self._text("class:feedback.note", stripped))
+
+    # Notices
 
     def show_info(self, message: str) -> None:
         """Show an informational message."""
-        self._content.append(("class:feedback.note", f"\n{self._wrap_text(message)}\n"))
+        self._add(self._start_entry(), self._text("class:feedback.note", message, blank_before=True))
 
     def show_error(self, message: str) -> None:
         """Show an error message."""
-        self._content.append(("class:feedback.bad", f"\nError: {self._wrap_text(message)}\n"))
+        self._add(
+            self._start_entry(),
+            self._text("class:feedback.bad", message, prefix=("class:feedback.bad", "Error: "), blank_before=True),
+        )
+
+    def scroll(self, delta: int) -> None:
+        """Scroll by `delta` lines (negative is up)."""
+        self.view.scroll(delta)
 
     def clear(self) -> None:
         """Clear the feedback display."""
-        self._content = []
-        self._streaming_text = ""
-        self._is_streaming = False
+        self.view.clear()
+        self._entries.clear()
+        self._paged_blocks = self._paged_feedback = 0
+        self._feedback_entry = self._stream_entry = None
+        self._techniques = self._partial = None
+        self._provisional = None
@@ -0,0 +1,64 @@
+"""Frame-rate-limited repainting of the application."""
+
+import asyncio
+import time
+from typing import Optional
+
+from prompt_toolkit import Application
+
+from mi_trainer.config import RENDER_MAX_FPS, RENDER_MIN_FPS
+
+
+class RenderScheduler:
+    """Coalesces repaint requests into frames at no more than `max_fps`.
+
+    `request()` is cheap enough to call for every streamed chunk from any
+    number of concurrent streams: at most one repaint is pending at a time,
+    and it picks up everything appended since the last frame. Keystrokes
+    repaint through prompt_toolkit directly, so typing is never throttled.
+
+    Render time is measured with the application's render events. When a
+    frame takes more than half its interval, the interval grows (down to
+    `min_fps`) to leave the event loop free for input; it shrinks back once
+    rendering is cheap again.
+    """
+
+    def __init__(
+        self,
+        app: Application,
+        max_fps: float = RENDER_MAX_FPS,
+        min_fps: float = RENDER_MIN_FPS,
+    ):
+        self.app = app
+        self.min_interval = 1 / max_fps
+        self.max_interval = 1 / min(min_fps, max_fps)
+        self.interval = self.min_interval
+        self._pending: Optional[asyncio.TimerHandle] = None
+        self._last_frame = 0.0
+        self._render_started = 0.0
+        app.before_render += self._before_render
+        app.after_render += self._after_render
+
+    def request(self) -> None:
+        """Ask for a repaint; repeated calls before the next frame are merged."""
+        if self._pending is not None:
+            return
+        delay = self._last_frame + self.interval - time.perf_counter()
+        self._pending = asyncio.get_running_loop().call_later(max(0.0, delay), self._flush)
+
+    def _flush(self) -> None:
+        self._pending = None
+        self._last_frame = time.perf_counter()
+        self.app.invalidate()
+
+    def _before_render(self, app: Application) -> None:
+        self._render_started = time.perf_counter()
+
+    def _after_render(self, app: Application) -> None:
+        now = time.perf_counter()
+        duration = now - self._render_started
+        self._last_frame = now
+        if duration > self.interval / 2:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+        elif duration < self.interval / 8:
+            self.interval = max(self.min_interval, self.interval * 0.8)
@@ -16,6 +16,7 @@ APP_STYLE = Style.from_dict({
     # Feedback pane
     "feedback": "bg:#16213e",
     "feedback.header": "#00d9ff bold",
+    "feedback.section": "#ffc107 bold",
     "feedback.good": "#00ff88",
     "feedback.warning": "#ffc107",
     "feedback.bad": "#ff4757",
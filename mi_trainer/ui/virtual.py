@@ -0,0 +1,238 @@
+"""Virtualized, scrollable line views for long panes."""
+
+from bisect import bisect_right
+from typing import Callable, Optional, Sequence
+
+from prompt_toolkit.data_structures import Point
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.layout.containers import ScrollOffsets, Window
+from prompt_toolkit.layout.controls import UIContent, UIControl
+from prompt_toolkit.layout.margins import ScrollbarMargin
+from prompt_toolkit.mouse_events import MouseEvent, MouseEventType
+
+from mi_trainer.ui.wrapping import WrappedText
+
+
+class Block:
+    """A piece of pane content that renders to some number of lines at a given width."""
+
+    def line_count(self, width: int) -> int:
+        raise NotImplementedError
+
+    def line(self, width: int, index: int) -> StyleAndTextTuples:
+        raise NotImplementedError
+
+
+class TextBlock(Block):
+    """Wrapped text, optionally led by a prefix (a label or marker) and a blank line.
+
+    Every line of the text is wrapped `len(prefix)` columns narrower, so the
+    prefix on the first line never pushes it past the pane's edge.
+    """
+
+    def __init__(
+        self,
+        style: str,
+        text: WrappedText,
+        prefix: tuple[str, str] = ("", ""),
+        blank_before: bool = False,
+        width_offset: Optional[int] = None,
+    ):
+        self.style = style
+        self.text = text
+        self.prefix = prefix
+        self.blank_before = blank_before
+        self.width_offset = len(prefix[1]) if width_offset is None else width_offset
+
+    def _text_width(self, width: int) -> int:
+        return max(1, width - self.width_offset)
+
+    def line_count(self, width: int) -> int:
+        return self.text.line_count(self._text_width(width)) + self.blank_before
+
+    def line(self, width: int, index: int) -> StyleAndTextTuples:
+        if self.blank_before:
+            if index == 0:
+                return []
+            index -= 1
+        text = self.text.line(self._text_width(width), index)
+        if index == 0 and self.prefix[1]:
+            return [self.prefix, (self.style, text)]
+        return [(self.style, text)]
+
+
+class FixedBlock(Block):
+    """Lines that are never wrapped, such as headers and separators."""
+
+    def __init__(self, lines: Sequence[StyleAndTextTuples]):
+        self.lines = list(lines)
+
+    def line_count(self, width: int) -> int:
+        return len(self.lines)
+
+    def line(self, width: int, index: int) -> StyleAndTextTuples:
+        return self.lines[index]
+
+
+class LineView(UIControl):
+    """A scrollable view over a list of blocks that renders only visible lines.
+
+    The end line of every block is kept in a cumulative index, so finding
+    the block for a line is a binary search, and a change to a block only
+    re-counts the blocks from it onwards (appending to the last block is
+    O(1)). prompt_toolkit asks for lines lazily, so only the rows on
+    screen are ever styled.
+
+    The view follows the bottom as content is added unless the user has
+    scrolled up; scrolling back to the bottom resumes following. When the
+    view reaches the top, `on_top` is called to page in older content.
+    """
+
+    def __init__(self, placeholder: StyleAndTextTuples = ()):
+        self.blocks: list[Block] = []
+        self.placeholder = list(placeholder)
+        self.follow = True
+        self.top = 0
+        self.on_top: Optional[Callable[[], None]] = None
+        self._ends: list[int] = []
+        self._valid = 0
+        self._width = 0
+        self._height = 0
+
+    # Content
+
+    def changed(self, index: int = -1) -> None:
+        """Note that blocks from `index` on were replaced or changed size."""
+        if index < 0:
+            index += len(self.blocks)
+        self._valid = max(0, min(self._valid, index))
+
+    def append(self, block: Block) -> None:
+        self.blocks.append(block)
+
+    def truncate(self, index: int) -> None:
+        """Remove the blocks from `index` on."""
+        del self.blocks[index:]
+        self.changed(index)
+
+    def insert(self, index: int, blocks: Sequence[Block]) -> None:
+        """Insert blocks before `index`, keeping the visible lines in place."""
+        if not blocks:
+            return
+        first = self._line_before(index)
+        self.blocks[index:index] = blocks
+        self.changed(index)
+        if not self.follow and first <= self.top:
+            self.top += self._line_before(index + len(blocks)) - first
+
+    def remove(self, start: int, end: int) -> None:
+        """Remove `blocks[start:end]`, keeping the visible lines in place."""
+        if end <= start:
+            return
+        first = self._line_before(start)
+        removed = self._line_before(end) - first
+        del self.blocks[start:end]
+        self.changed(start)
+        if not self.follow and first < self.top:
+            self.top = max(first, self.top - removed)
+
+    def clear(self) -> None:
+        self.blocks = []
+        self.changed(0)
+        self.follow = True
+        self.top = 0
+
+    # Line index
+
+    def _ensure_index(self, width: Optional[int] = None) -> list[int]:
+        """Bring the cumulative line index up to date (for `width` if given)."""
+        if width is not None and width != self._width:
+            self._width = width
+            self._valid = 0
+        if self._valid < len(self.blocks):
+            del self._ends[self._valid:]
+            total = self._ends[-1] if self._ends else 0
+            for block in self.blocks[self._valid:]:
+                total += block.line_count(self._width)
+                self._ends.append(total)
+            self._valid = len(self.blocks)
+        del self._ends[len(self.blocks):]
+        return self._ends
+
+    def _line_before(self, index: int) -> int:
+        """The first line of block `index` (only needed once the view has scrolled)."""
+        if self.follow or not index:
+            return 0
+        return self._ensure_index()[index - 1]
+
+    def line_count(self, width: Optional[int] = None) -> int:
+        ends = self._ensure_index(width)
+        return ends[-1] if ends else 0
+
+    def get_line(self, index: int) -> StyleAndTextTuples:
+        ends = self._ensure_index()
+        i = bisect_right(ends, index)
+        if i >= len(self.blocks):
+            return []
+        start = ends[i - 1] if i else 0
+        return self.blocks[i].line(self._width, index - start)
+
+    # Scrolling
+
+    def _max_top(self, count: int) -> int:
+        return max(0, count - self._height)
+
+    def scroll(self, delta: int) -> None:
+        """Scroll by `delta` lines (negative is up)."""
+        count = self.line_count()
+        top = (self._max_top(count) if self.follow else self.top) + delta
+        self.top = max(0, min(top, self._max_top(count)))
+        self.follow = self.top >= self._max_top(count)
+        if self.top == 0 and delta < 0 and self.on_top is not None:
+            self.on_top()
+
+    def vertical_scroll(self, window: Window) -> int:
+        return self._max_top(self.line_count()) if self.follow else self.top
+
+    # UIControl
+
+    def is_focusable(self) -> bool:
+        return False
+
+    def create_content(self, width: int, height: int) -> UIContent:
+        self._height = height
+        count = self.line_count(width)
+        if not count and self.placeholder:
+            return UIContent(get_line=lambda i: self.placeholder, line_count=1, show_cursor=False)
+
+        if self.follow:
+            self.top = self._max_top(count)
+        else:
+            self.top = min(self.top, self._max_top(count))
+        # The window keeps the cursor in view, so park it on the top visible line
+        return UIContent(
+            get_line=self.get_line,
+            line_count=count,
+            cursor_position=Point(x=0, y=self.top),
+            show_cursor=False,
+        )
+
+    def mouse_handler(self, mouse_event: MouseEvent):
+        if mouse_event.event_type == MouseEventType.SCROLL_UP:
+            self.scroll(-3)
+        elif mouse_event.event_type == MouseEventType.SCROLL_DOWN:
+            self.scroll(3)
+        else:
+            return NotImplemented
+        return None
+
+
+def line_view_window(view: LineView) -> Window:
+    """A window showing a `LineView`, with a scrollbar."""
+    return Window(
+        content=view,
+        wrap_lines=False,  # Blocks wrap themselves
+        get_vertical_scroll=view.vertical_scroll,
+        scroll_offsets=ScrollOffsets(top=0, bottom=0),
+        right_margins=[ScrollbarMargin(display_arrows=False)],
+    )
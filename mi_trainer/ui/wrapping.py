@@ -0,0 +1,120 @@
+"""Incremental word wrapping for streamed text."""
+
+import re
+from typing import Optional
+
+# Newlines, runs of other whitespace, and words
+_TOKENS = re.compile(r"\n|[^\S\n]+|\S+")
+
+
+class WrappedText:
+    """Text wrapped at word boundaries for one width, extended as text is appended.
+
+    Wrapping is greedy, so appending text can only change the last line:
+    every earlier line is final. `append` therefore costs time proportional
+    to the appended text, not to the whole message. Asking for a different
+    width re-wraps everything once and caches the result for that width.
+
+    Words longer than a line are split across lines. Blank lines in the text
+    are kept, as paragraph breaks.
+    """
+
+    def __init__(self, text: str = "", indent: str = "", subsequent_indent: str = ""):
+        self.indent = indent
+        self.subsequent_indent = subsequent_indent
+        self._chunks: list[str] = []
+        self._reset(0)
+        if text:
+            self.append(text)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def _reset(self, width: int) -> None:
+        self.width = width
+        self._lines: list[str] = []  # Final lines
+        self._line = ""  # Words placed on the open line
+        self._line_indent = self.indent
+        self._word = ""  # Word still being streamed in
+        self._tail: Optional[list[str]] = None
+
+    def append(self, text: str) -> None:
+        """Add text to the end, wrapping only what changed."""
+        self._chunks.append(text)
+        if self.width:
+            self._feed(text)
+
+    def _feed(self, text: str) -> None:
+        self._tail = None
+        for token in _TOKENS.findall(text):
+            if token == "\n":
+                self._place_word()
+                self._lines.append(self._line_indent + self._line if self._line else "")
+                self._line = ""
+                self._line_indent = self.indent
+            elif token.isspace():
+                self._place_word()
+            else:
+                self._word += token
+
+    def _place_word(self) -> None:
+        if self._word:
+            self._line, self._line_indent = self._place(
+                self._lines, self._line, self._line_indent, self._word
+            )
+            self._word = ""
+
+    def _place(self, lines: list[str], line: str, indent: str, word: str) -> tuple[str, str]:
+        """Put `word` on the open line, closing full lines into `lines`.
+
+        Returns the new open line and its indent.
+        """
+        candidate = f"{line} {word}" if line else word
+        if len(indent) + len(candidate) <= self.width:
+            return candidate, indent
+
+        if line:
+            lines.append(indent + line)
+            indent = self.subsequent_indent
+        room = max(1, self.width - len(indent))
+        while len(word) > room:
+            lines.append(indent + word[:room])
+            word = word[room:]
+            indent = self.subsequent_indent
+            room = max(1, self.width - len(indent))
+        return word, indent
+
+    def _tail_lines(self) -> list[str]:
+        """The open line, with any partial word placed on a copy of it."""
+        if self._tail is None:
+            lines: list[str] = []
+            line, indent = self._line, self._line_indent
+            if self._word:
+                line, indent = self._place(lines, line, indent, self._word)
+            lines.append(indent + line if line else "")
+            self._tail = lines
+        return self._tail
+
+    def wrap(self, width: int) -> None:
+        """Make sure the text is wrapped for `width`, re-wrapping if it changed."""
+        width = max(1, width)
+        if width != self.width:
+            text = self.text
+            self._chunks = [text]
+            self._reset(width)
+            self._feed(text)
+
+    def line_count(self, width: int) -> int:
+        self.wrap(width)
+        return len(self._lines) + len(self._tail_lines())
+
+    def line(self, width: int, index: int) -> str:
+        self.wrap(width)
+        if index < len(self._lines):
+            return self._lines[index]
+        return self._tail_lines()[index - len(self._lines)]
+
+    def lines(self, width: int) -> list[str]:
+        self.wrap(width)
+        return self._lines + self._tail_lines()